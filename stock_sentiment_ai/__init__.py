@@ -2,9 +2,19 @@ __all__ = [
     "config",
     "topics",
     "feeds",
+    "neardup",
     "sentiment",
+    "cascade",
+    "workers",
     "scanner",
+    "store",
+    "dailylog",
+    "batch",
     "insiders_sec",
+    "form4",
+    "edgar_bulk",
     "politicians_quiver",
     "briefing",
+    "profiling",
+    "bench",
 ]
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .scanner import ScoredItem
+
+# Columnar container for large sets of scored headlines (history queries,
+# long watch sessions). One list per string column, with publisher / author /
+# label / used dictionary-encoded into small int arrays, and publish times as
+# int64 epoch seconds, so window filters and sorts are array operations
+# instead of per-object datetime comparisons.
+
+NO_TS = np.iinfo(np.int64).min  # unknown publish time
+
+
+def _to_ts(dt: Optional[datetime]) -> int:
+    return int(dt.timestamp()) if dt is not None else NO_TS
+
+
+class _Vocab:
+    """Dictionary encoding for a low-cardinality string column."""
+
+    __slots__ = ("values", "_index")
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def code(self, s: str) -> int:
+        i = self._index.get(s)
+        if i is None:
+            i = self._index[s] = len(self.values)
+            self.values.append(sys.intern(s))
+        return i
+
+
+class ItemBatch:
+    __slots__ = (
+        "titles",
+        "links",
+        "published_raw",
+        "published_ts",
+        "confidence",
+        "cluster_size",
+        "_source_codes",
+        "_author_codes",
+        "_label_codes",
+        "_used_codes",
+        "_sources",
+        "_authors",
+        "_labels",
+        "_used",
+    )
+
+    def __init__(self) -> None:
+        self.titles: List[str] = []
+        self.links: List[str] = []
+        self.published_raw: List[str] = []
+        self.published_ts = np.empty(0, dtype=np.int64)
+        self.confidence = np.empty(0, dtype=np.float64)
+        self.cluster_size = np.empty(0, dtype=np.int32)
+        self._source_codes = np.empty(0, dtype=np.int32)
+        self._author_codes = np.empty(0, dtype=np.int32)
+        self._label_codes = np.empty(0, dtype=np.int8)
+        self._used_codes = np.empty(0, dtype=np.int8)
+        self._sources = _Vocab()
+        self._authors = _Vocab()
+        self._labels = _Vocab()
+        self._used = _Vocab()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[object]]) -> "ItemBatch":
+        """
+        Build from (label, confidence, title, link, source, author,
+        published_raw, published_ts, used, cluster_size) tuples, the
+        HeadlineStore column order. published_ts is epoch seconds, or None
+        / NO_TS when unknown.
+        """
+        b = cls()
+        ts: List[int] = []
+        conf: List[float] = []
+        sizes: List[int] = []
+        src: List[int] = []
+        auth: List[int] = []
+        lab: List[int] = []
+        used: List[int] = []
+        for label, c, title, link, source, author, raw, t, u, n in rows:
+            lab.append(b._labels.code(str(label)))
+            conf.append(float(c))
+            b.titles.append(str(title))
+            b.links.append(str(link))
+            src.append(b._sources.code(str(source)))
+            auth.append(b._authors.code(str(author)))
+            b.published_raw.append(str(raw))
+            ts.append(NO_TS if t is None else int(t))
+            used.append(b._used.code(str(u)))
+            sizes.append(int(n))
+
+        b.published_ts = np.asarray(ts, dtype=np.int64)
+        b.confidence = np.asarray(conf, dtype=np.float64)
+        b.cluster_size = np.asarray(sizes, dtype=np.int32)
+        b._source_codes = np.asarray(src, dtype=np.int32)
+        b._author_codes = np.asarray(auth, dtype=np.int32)
+        b._label_codes = np.asarray(lab, dtype=np.int8)
+        b._used_codes = np.asarray(used, dtype=np.int8)
+        return b
+
+    @classmethod
+    def from_items(cls, items: Iterable[ScoredItem]) -> "ItemBatch":
+        return cls.from_rows(
+            (
+                it.label,
+                it.confidence,
+                it.title,
+                it.link,
+                it.source,
+                it.author,
+                it.published_raw,
+                _to_ts(it.published_dt),
+                it.used,
+                it.cluster_size,
+            )
+            for it in items
+        )
+
+    def __len__(self) -> int:
+        return len(self.links)
+
+    @property
+    def labels(self) -> List[str]:
+        return [self._labels.values[c] for c in self._label_codes.tolist()]
+
+    @property
+    def sources(self) -> List[str]:
+        return [self._sources.values[c] for c in self._source_codes.tolist()]
+
+    def item(self, i: int) -> ScoredItem:
+        ts = int(self.published_ts[i])
+        return ScoredItem(
+            label=self._labels.values[self._label_codes[i]],
+            confidence=float(self.confidence[i]),
+            title=self.titles[i],
+            link=self.links[i],
+            source=self._sources.values[self._source_codes[i]],
+            author=self._authors.values[self._author_codes[i]],
+            published_raw=self.published_raw[i],
+            published_dt=None if ts == NO_TS else datetime.fromtimestamp(ts, tz=timezone.utc),
+            used=self._used.values[self._used_codes[i]],
+            cluster_size=int(self.cluster_size[i]),
+        )
+
+    def __iter__(self) -> Iterator[ScoredItem]:
+        for i in range(len(self)):
+            yield self.item(i)
+
+    def to_items(self) -> List[ScoredItem]:
+        return list(self)
+
+    # ---- array operations ----
+    def window_mask(
+        self,
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime],
+        keep_unknown: bool = False,
+    ) -> np.ndarray:
+        ts = self.published_ts
+        known = ts != NO_TS
+        mask = known.copy()
+        if start_dt is not None:
+            mask &= ts >= _to_ts(start_dt)
+        if end_dt is not None:
+            mask &= ts <= _to_ts(end_dt)
+        if keep_unknown:
+            mask |= ~known
+        return mask
+
+    def select(self, idx: Union[np.ndarray, Sequence[int]]) -> "ItemBatch":
+        """Rows by boolean mask or integer index array (in that order)."""
+        idx = np.asarray(idx)
+        idx = np.flatnonzero(idx) if idx.dtype == bool else idx.astype(np.intp, copy=False)
+        rows = idx.tolist()
+
+        b = ItemBatch()
+        b.titles = [self.titles[i] for i in rows]
+        b.links = [self.links[i] for i in rows]
+        b.published_raw = [self.published_raw[i] for i in rows]
+        b.published_ts = self.published_ts[idx]
+        b.confidence = self.confidence[idx]
+        b.cluster_size = self.cluster_size[idx]
+        b._source_codes = self._source_codes[idx]
+        b._author_codes = self._author_codes[idx]
+        b._label_codes = self._label_codes[idx]
+        b._used_codes = self._used_codes[idx]
+        # Vocabularies are shared; codes stay valid
+        b._sources, b._authors, b._labels, b._used = self._sources, self._authors, self._labels, self._used
+        return b
+
+    def window(
+        self,
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime],
+        keep_unknown: bool = False,
+    ) -> "ItemBatch":
+        return self.select(self.window_mask(start_dt, end_dt, keep_unknown))
+
+    def top_by_confidence(self, k: Optional[int] = None) -> "ItemBatch":
+        # Stable, so ties keep their current order like list.sort
+        order = np.argsort(-self.confidence, kind="stable")
+        return self.select(order if k is None else order[:k])
+
+    def newest_first(self) -> "ItemBatch":
+        # Unknown times (NO_TS) sort last
+        return self.select(np.argsort(-self.published_ts.astype(np.float64), kind="stable"))
+
+    def label_counts(self) -> Dict[str, int]:
+        counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
+        if len(self):
+            for code, n in enumerate(np.bincount(self._label_codes, minlength=len(self._labels.values)).tolist()):
+                if n:
+                    label = self._labels.values[code]
+                    counts[label] = counts.get(label, 0) + n
+        return counts
@@ -0,0 +1,480 @@
+from __future__ import annotations
+
+# Offline benchmark suite for fetch -> dedupe -> score -> render.
+#
+#   python -m stock_sentiment_ai.bench                    # JSON to stdout
+#   python -m stock_sentiment_ai.bench --out run.json
+#   python -m stock_sentiment_ai.bench --compare base.json --out run.json
+#
+# Synthetic Google News-style RSS feeds are served from a local HTTP server,
+# so nothing touches the network. On-disk caches and the headline store are
+# switched off (they'd turn repeat runs into cache benchmarks); set these
+# before the package config is imported.
+import os
+
+os.environ.setdefault("FEED_CACHE", "0")
+os.environ.setdefault("SENTIMENT_CACHE", "0")
+os.environ.setdefault("HEADLINE_STORE", "0")
+os.environ.setdefault("SAVE_DAILY_LOG", "0")
+
+import argparse
+import contextlib
+import gc
+import hashlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import feedparser
+
+from . import briefing, feeds, scanner, sentiment
+from .batch import ItemBatch
+from .config import SentimentResult
+from .fixtures import make_headline, make_rss
+from .topics import TOPICS
+
+SIZES = (100, 1000, 10000)
+
+
+# ==========================
+# Fixtures
+# ==========================
+def bench_parsers(size: int, repeat: int) -> List[Dict[str, object]]:
+    doc = make_rss(size)
+    fast = feeds._parse_rss_fast(doc)
+    ref = feeds._items_from_entries(feedparser.parse(doc).entries)
+    return [
+        _result(
+            "parse_rss[fast]", size, len(ref),
+            _time(lambda: feeds._parse_rss_fast(doc), repeat),
+            identical=fast == ref,
+        ),
+        _result(
+            "parse_rss[feedparser]", size, len(ref),
+            _time(lambda: feeds._items_from_entries(feedparser.parse(doc).entries), repeat),
+        ),
+    ]
+
+
+class FixtureServer:
+    """Serves /feed/<size>/<offset>.xml from memory on 127.0.0.1."""
+
+    def __init__(self) -> None:
+        self._bodies: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        bodies, lock = self._bodies, self._lock
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                try:
+                    _, _, size, name = self.path.split("/", 3)
+                    key = f"{int(size)}/{int(name.split('.')[0])}"
+                except ValueError:
+                    self.send_error(404)
+                    return
+
+                with lock:
+                    body = bodies.get(key)
+                    if body is None:
+                        n, off = key.split("/")
+                        body = bodies[key] = make_rss(int(n), int(off))
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "FixtureServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def url(self, size: int, offset: int = 0) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/feed/{size}/{offset}.xml"
+
+
+class StubBackend(sentiment.SentimentBackend):
+    """Deterministic stand-in for the model: measures pipeline overhead only."""
+
+    name = "stub"
+    _LABELS = ("Positive", "Negative", "Neutral")
+
+    def predict_batch(self, texts: Sequence[str], batch_size: int = 32) -> List[SentimentResult]:
+        out: List[SentimentResult] = []
+        for t in texts:
+            h = hashlib.blake2b(t.encode("utf-8"), digest_size=2).digest()
+            out.append(SentimentResult(self._LABELS[h[0] % 3], 0.34 + (h[1] / 255.0) * 0.66))
+        return out
+
+
+@contextlib.contextmanager
+def synthetic_topics(server: FixtureServer, size: int, feeds_per_topic: int = 3):
+    """
+    Temporarily replace TOPICS with five topics whose feeds are local
+    fixtures. Neighbouring feeds overlap by half, and the last feed of each
+    topic is the first of the next, so dedupe and cross-topic sharing both
+    have work to do.
+    """
+    saved = dict(TOPICS)
+    TOPICS.clear()
+    step = size // 2
+    for t, key in enumerate(["gold", "oil", "ai", "crypto", "world"]):
+        base = t * (feeds_per_topic - 1)
+        TOPICS[key] = {
+            "queries": [],
+            "extra_rss": [server.url(size, (base + j) * step) for j in range(feeds_per_topic)],
+            "tickers": [],
+        }
+    try:
+        yield
+    finally:
+        TOPICS.clear()
+        TOPICS.update(saved)
+
+
+@contextlib.contextmanager
+def use_backend(backend: sentiment.SentimentBackend):
+    saved = sentiment._BACKEND
+    sentiment._BACKEND = backend
+    try:
+        yield
+    finally:
+        sentiment._BACKEND = saved
+
+
+# ==========================
+# Timing
+# ==========================
+def _time(fn: Callable[[], object], repeat: int) -> List[float]:
+    runs: List[float] = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return runs
+
+
+def _result(name: str, size: int, items: int, runs: List[float], **extra) -> Dict[str, object]:
+    best = min(runs)
+    row: Dict[str, object] = {
+        "name": name,
+        "size": size,
+        "items": items,
+        "repeat": len(runs),
+        "min_s": round(best, 6),
+        "median_s": round(statistics.median(runs), 6),
+        "items_per_s": round(items / best, 1) if best > 0 else None,
+    }
+    row.update(extra)
+    return row
+
+
+def bench_fetch_parse(server: FixtureServer, size: int, repeat: int) -> Dict[str, object]:
+    url = server.url(size)
+    feeds.fetch_rss(url, use_cache=False)  # warm the server-side fixture
+    items = len(feeds.fetch_rss(url, use_cache=False))
+    runs = _time(lambda: feeds.fetch_rss(url, use_cache=False), repeat)
+    return _result("fetch_rss", size, items, runs)
+
+
+def bench_dedupe_filter(server: FixtureServer, size: int, repeat: int) -> Dict[str, object]:
+    # Three overlapping feeds' worth of items, as scan_topic sees them
+    raw: List[feeds.FeedItem] = []
+    for j in range(3):
+        raw.extend(feeds.fetch_rss(server.url(size, j * (size // 2)), use_cache=False))
+    since = datetime.now(timezone.utc) - timedelta(hours=24)
+
+    def run() -> None:
+        deduped = scanner._dedupe_by_link(raw)
+        filtered = scanner.ItemFilter(since).apply(deduped)
+        scanner._cluster(filtered, True)
+
+    runs = _time(run, repeat)
+    deduped = scanner._dedupe_by_link(raw)
+    kept = scanner.ItemFilter(since).apply(deduped)
+    reps, _ = scanner._cluster(kept, True)
+    return _result(
+        "dedupe_window_cluster", size, len(raw), runs,
+        deduped=len(deduped), in_window=len(kept), clusters=len(reps),
+    )
+
+
+def bench_scoring(backend: sentiment.SentimentBackend, size: int, repeat: int) -> Dict[str, object]:
+    r = random.Random(size)
+    texts = [make_headline(r, i) for i in range(size)]
+    backend.predict_batch(texts[:32])  # warm-up
+    runs = _time(lambda: backend.predict_batch(texts), repeat)
+    return _result(f"score[{backend.name}]", size, size, runs)
+
+
+def bench_scan_topic(server: FixtureServer, size: int, repeat: int) -> Dict[str, object]:
+    with synthetic_topics(server, size), use_backend(StubBackend()):
+        items = len(scanner.scan_topic("gold", top_k=10 ** 9)[0])
+        runs = _time(lambda: scanner.scan_topic("gold", top_k=10), repeat)
+    return _result("scan_topic", size, items, runs)
+
+
+# Plain (dict-backed, un-interned) records, as FeedItem / ScoredItem were
+# before they became slotted; the "before" side of the memory benchmark.
+@dataclass
+class _PlainFeedItem:
+    title: str
+    link: str
+    source: str
+    summary: str
+    author: str
+    published_raw: str
+    published_dt: Optional[datetime]
+
+
+@dataclass(frozen=True)
+class _PlainScoredItem:
+    label: str
+    confidence: float
+    title: str
+    link: str
+    source: str
+    author: str
+    published_raw: str
+    published_dt: Optional[datetime]
+    used: str
+    cluster_size: int = 1
+
+
+def _fresh(s: str) -> str:
+    # A new string object with the same value, like a parser hands back per item
+    return s.encode("utf-8").decode("utf-8")
+
+
+def _retained(build: Callable[[], Any]) -> Tuple[int, Any]:
+    """Bytes still allocated once build() returns, and its result."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        obj = build()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, obj
+
+
+def _scored_rows(items: Sequence[feeds.FeedItem]) -> List[Tuple[Any, ...]]:
+    labels = StubBackend().predict_batch([it.title for it in items])
+    return [
+        (r.label, r.confidence, it.title, it.link, it.source, it.author, it.published_raw, it.published_dt, "TITLEONLY", 1)
+        for it, r in zip(items, labels)
+    ]
+
+
+def bench_memory(size: int) -> List[Dict[str, object]]:
+    """
+    Bytes per item held by each representation of `size` parsed headlines:
+    plain dataclasses vs slotted/interned records vs the columnar ItemBatch.
+    """
+    doc = make_rss(size)
+    names = [f.name for f in fields(_PlainFeedItem)]
+
+    def plain_feed() -> List[_PlainFeedItem]:
+        out = []
+        for it in feeds._parse_rss_fast(doc) or []:
+            vals = [getattr(it, n) for n in names]
+            vals[2], vals[4] = _fresh(vals[2]), _fresh(vals[4])  # per-item source/author copies
+            out.append(_PlainFeedItem(*vals))
+        return out
+
+    def slotted_feed() -> List[feeds.FeedItem]:
+        return feeds._parse_rss_fast(doc) or []
+
+    base = slotted_feed()
+
+    def plain_scored() -> List[_PlainScoredItem]:
+        out = []
+        for row in _scored_rows(base):
+            vals = list(row)
+            vals[4], vals[5] = _fresh(vals[4]), _fresh(vals[5])
+            out.append(_PlainScoredItem(*vals))
+        return out
+
+    def slotted_scored() -> List[scanner.ScoredItem]:
+        out = []
+        for row in _scored_rows(base):
+            vals = list(row)
+            vals[4], vals[5] = _fresh(vals[4]), _fresh(vals[5])
+            out.append(scanner.ScoredItem(*vals))
+        return out
+
+    scored = slotted_scored()
+
+    def batch() -> ItemBatch:
+        return ItemBatch.from_items(scored)
+
+    # The scored representations share title / link / datetime objects with
+    # `base`, so their numbers are what each record layout adds on top.
+    rows: List[Dict[str, object]] = []
+    n = len(base)
+    for name, build in (
+        ("memory[feed_items:dataclass]", plain_feed),
+        ("memory[feed_items:slotted]", slotted_feed),
+        ("memory[scored_items:dataclass]", plain_scored),
+        ("memory[scored_items:slotted]", slotted_scored),
+        ("memory[scored_items:batch]", batch),
+    ):
+        nbytes, obj = _retained(build)
+        rows.append({"name": name, "size": size, "items": n, "bytes": nbytes, "bytes_per_item": round(nbytes / max(1, n), 1)})
+        del obj
+    return rows
+
+
+def bench_window_sort(size: int, repeat: int) -> List[Dict[str, object]]:
+    """Window + top-k by confidence over `size` scored items: object list vs ItemBatch."""
+    items = [scanner.ScoredItem(*row) for row in _scored_rows(feeds._parse_rss_fast(make_rss(size)) or [])]
+    batch = ItemBatch.from_items(items)
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(hours=24)
+
+    def with_list() -> List[scanner.ScoredItem]:
+        kept = [it for it in items if it.published_dt is not None and start <= it.published_dt <= end]
+        kept.sort(key=lambda x: x.confidence, reverse=True)
+        return kept[:10]
+
+    def with_batch() -> ItemBatch:
+        return batch.window(start, end).top_by_confidence(10)
+
+    return [
+        _result("window_top10[list]", size, len(items), _time(with_list, repeat)),
+        _result(
+            "window_top10[batch]", size, len(items), _time(with_batch, repeat),
+            same_result=[it.link for it in with_list()] == with_batch().links,
+        ),
+    ]
+
+
+def bench_briefing(server: FixtureServer, size: int, repeat: int) -> Dict[str, object]:
+    args = briefing.build_parser().parse_args(["--mode", "last24"])
+    first_topic_ms: List[int] = []
+
+    def run() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = briefing.run_streaming(args)
+        first_topic_ms.append(stats.get("first_topic_ms", 0))
+
+    with synthetic_topics(server, size), use_backend(StubBackend()):
+        runs = _time(run, repeat)
+    # Time until the first topic block is on screen
+    return _result("briefing_streaming", size, size * 15, runs, first_topic_s=min(first_topic_ms) / 1000.0)
+
+
+def run_suite(
+    sizes: Sequence[int] = SIZES,
+    repeat: int = 3,
+    include_vader: bool = True,
+    include_model: bool = False,
+) -> Dict[str, object]:
+    results: List[Dict[str, object]] = []
+
+    backends: List[sentiment.SentimentBackend] = [StubBackend()]
+    if include_vader:
+        try:
+            backends.append(sentiment.VaderBackend())
+        except Exception:
+            pass
+    if include_model:
+        # Whatever SENTIMENT_MODEL / SENTIMENT_BACKEND point at (e.g. a tiny local model)
+        backend = sentiment.get_backend()
+        if backend.name != "vader":
+            backends.append(backend)
+
+    with FixtureServer() as server:
+        for size in sizes:
+            results.extend(bench_parsers(size, repeat))
+            results.append(bench_fetch_parse(server, size, repeat))
+            results.append(bench_dedupe_filter(server, size, repeat))
+            for b in backends:
+                results.append(bench_scoring(b, size, repeat))
+            results.append(bench_scan_topic(server, size, repeat))
+            results.append(bench_briefing(server, size, repeat))
+            results.extend(bench_window_sort(size, repeat))
+            results.extend(bench_memory(size))
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": list(sizes),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], tolerance: float) -> List[str]:
+    """Names of benchmarks whose min time regressed by more than `tolerance` (0.2 = 20%)."""
+    base = {(r["name"], r["size"]): r for r in baseline.get("results", [])}  # type: ignore[union-attr]
+    regressions: List[str] = []
+    for r in current.get("results", []):  # type: ignore[union-attr]
+        b = base.get((r["name"], r["size"]))
+        if not b or not b.get("min_s"):
+            continue
+        ratio = float(r["min_s"]) / float(b["min_s"])
+        r["vs_baseline"] = round(ratio, 3)
+        if ratio > 1.0 + tolerance:
+            regressions.append(f"{r['name']}@{r['size']}: {ratio:.2f}x baseline")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline performance benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-vader", action="store_true")
+    parser.add_argument("--model", action="store_true", help="also time the configured HF model")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown vs baseline")
+    args = parser.parse_args()
+
+    report = run_suite(args.sizes, args.repeat, not args.no_vader, args.model)
+
+    regressions: List[str] = []
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions += compare(report, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if regressions:
+        print("Regressions:\n- " + "\n- ".join(regressions), file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
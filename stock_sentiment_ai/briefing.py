@@ -3,13 +3,27 @@ from __future__ import annotations
 
 import argparse
 import os
+import sys
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
-from typing import Dict, List, Tuple
-
+from typing import Container, Dict, List, MutableMapping, Optional, Tuple
+
+from . import feeds, profiling
+from .config import (
+    BLOCKED_SOURCES,
+    CASCADE_BUDGET_PER_TOPIC,
+    CASCADE_ENABLED,
+    WATCH_MAX_SEEN,
+    WINDOW_KEEP_UNDATED,
+)
+from .dailylog import DailyLogWriter, get_log_writer
 from .topics import TOPICS
-from .scanner import scan_topic, ScoredItem
+from .scanner import ItemFilter, iter_scan_topics, scan_all_topics, ScoredItem
+from .sentiment import get_backend
+from .store import HeadlineStore, get_store
+from .util import LRUDict
 
 ET = ZoneInfo("America/New_York")
 
@@ -87,22 +101,6 @@ def mode_window(mode: str, dt_now: datetime) -> Tuple[datetime | None, datetime
     return None, None, "window all"
 
 
-def should_keep_by_window(item: ScoredItem, start_dt: datetime | None, end_dt: datetime | None) -> bool:
-    """
-    Only filter if we actually have parsed datetimes.
-    If a feed doesn't give a parsable datetime, we keep it
-    (so you don't end up with 0 headlines).
-    """
-    if not start_dt or not end_dt:
-        return True
-
-    if item.published_dt is None:
-        return True
-
-    dt = item.published_dt.astimezone(ET)
-    return start_dt <= dt <= end_dt
-
-
 def print_topic_block(topic_key: str, items: List[ScoredItem], top_k: int) -> None:
     label = topic_key.upper()
     print(f"\n{label} — top {min(top_k, len(items))}\n")
@@ -112,57 +110,119 @@ def print_topic_block(topic_key: str, items: List[ScoredItem], top_k: int) -> No
 
     for i, r in enumerate(items[:top_k], start=1):
         meta = fmt_author_time_date(r.author, r.published_dt, r.published_raw)
-        print(f"{i}. [{r.label}] conf {r.confidence:.2f} {r.source} | {meta}")
+        similar = f" (+{r.cluster_size - 1} similar)" if r.cluster_size > 1 else ""
+        print(f"{i}. [{r.label}] conf {r.confidence:.2f} {r.source} | {meta}{similar}")
         print(f"   {r.title}")
         print(f"   {r.link}")
         print()
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--mode", default="auto", choices=["auto", "preopen", "last24"])
-    parser.add_argument("--clear", action="store_true")
-    parser.add_argument("--topk", type=int, default=6)
-    args = parser.parse_args()
+def build_filter(
+    args: argparse.Namespace,
+    start_dt: datetime | None,
+    end_dt: datetime | None,
+    store: Optional[HeadlineStore] = None,
+    known: Optional[MutableMapping[str, ScoredItem]] = None,
+) -> ItemFilter:
+    """
+    The briefing's pre-scoring filters: the mode window, the source
+    blocklist, and with --new-only, links seen in the store or in earlier
+    watch cycles.
+    """
+    return ItemFilter(
+        since_dt=start_dt,
+        until_dt=end_dt,
+        keep_undated=args.keep_undated,
+        seen_links=seen_links_for(store, known) if args.new_only else None,
+        blocked_sources=args.block_source,
+    )
+
+
+def seen_links_for(
+    store: Optional[HeadlineStore],
+    known: Optional[MutableMapping[str, ScoredItem]],
+) -> Optional[Container[str]]:
+    # Snapshot at scan start, so links stored or scored for an earlier topic
+    # of the same pass still count as new for the topics after it
+    if store is not None:
+        return store.seen_before()
+    if known is not None:
+        return frozenset(known)
+    return None
+
+
+def window_topic_from_store(
+    store: HeadlineStore,
+    topic_key: str,
+    start_dt: datetime | None,
+    end_dt: datetime | None,
+    limit: int,
+    keep_unknown: bool = True,
+) -> Tuple[List[ScoredItem], Dict[str, int]]:
+    # Indexed range queries; includes history that has aged out of the feeds,
+    # so this backs --from-store only, while live runs report the current scan
+    return (
+        store.query(topic_key, start_dt, end_dt, limit=limit, keep_unknown=keep_unknown),
+        store.label_counts(topic_key, start_dt, end_dt, keep_unknown=keep_unknown),
+    )
+
+
+def _add_totals(totals: Dict[str, int], counts: Dict[str, int]) -> None:
+    for k, v in counts.items():
+        if k in totals:
+            totals[k] += v
+
+
+def collect_window(
+    scans: Dict[str, Tuple[List[ScoredItem], Dict[str, int]]],
+) -> Tuple[Dict[str, List[ScoredItem]], Dict[str, int]]:
+    # Scans were window-filtered before scoring; just gather them
+    per_topic: Dict[str, List[ScoredItem]] = {}
+    totals = {"Positive": 0, "Negative": 0, "Neutral": 0}
 
-    if args.clear:
-        clear_screen()
+    for topic_key in TOPICS.keys():
+        per_topic[topic_key], counts = scans.get(topic_key, ([], {}))
+        _add_totals(totals, counts)
 
-    dt_now = now_et()
-    start_dt, end_dt, window_label = mode_window(args.mode, dt_now)
+    return per_topic, totals
 
-    # Header
-    print("=" * 88)
-    print(f"PRE-MARKET BRIEFING — {fmt_dt_header(dt_now)} | mode={args.mode} | {window_label}")
-    print("=" * 88)
 
-    # Gather per-topic headlines
-    all_items: List[ScoredItem] = []
+def collect_window_from_store(
+    store: HeadlineStore,
+    start_dt: datetime | None,
+    end_dt: datetime | None,
+    limit: int,
+    keep_unknown: bool = True,
+) -> Tuple[Dict[str, List[ScoredItem]], Dict[str, int]]:
     per_topic: Dict[str, List[ScoredItem]] = {}
     totals = {"Positive": 0, "Negative": 0, "Neutral": 0}
-    topic_counts: Dict[str, int] = {}
-
-    print("\nHEADLINES BY TOPIC")
 
     for topic_key in TOPICS.keys():
-        items, counts = scan_topic(topic_key, top_k=max(args.topk, 10), use_snippet=True)
+        per_topic[topic_key], counts = window_topic_from_store(
+            store, topic_key, start_dt, end_dt, limit, keep_unknown
+        )
+        _add_totals(totals, counts)
 
-        # Window filter (but keep items with unknown datetime)
-        items = [it for it in items if should_keep_by_window(it, start_dt, end_dt)]
+    return per_topic, totals
 
-        per_topic[topic_key] = items
-        topic_counts[topic_key] = len(items)
 
-        # Totals for sentiment
-        for k, v in counts.items():
-            if k in totals:
-                totals[k] += v
+def print_header(args: argparse.Namespace, dt_now: datetime, window_label: str) -> None:
+    print("=" * 88)
+    print(f"PRE-MARKET BRIEFING — {fmt_dt_header(dt_now)} | mode={args.mode} | {window_label}")
+    print("=" * 88)
 
-        all_items.extend(items)
+    print("\nHEADLINES BY TOPIC")
 
-    # Print topics
+
+def print_summary(
+    args: argparse.Namespace,
+    per_topic: Dict[str, List[ScoredItem]],
+    totals: Dict[str, int],
+    scan_stats: Optional[Dict[str, int]],
+) -> None:
+    all_items: List[ScoredItem] = []
     for topic_key in TOPICS.keys():
-        print_topic_block(topic_key, per_topic[topic_key], args.topk)
+        all_items.extend(per_topic[topic_key])
 
     # Key metrics (bottom like your latest output)
     print("=" * 88)
@@ -170,7 +230,30 @@ def main() -> None:
     print("KEY METRICS")
     print(f"- Overall: {overall_n} items | Sentiment totals: {totals['Positive']} pos / {totals['Negative']} neg / {totals['Neutral']} neutral")
     for topic_key in TOPICS.keys():
-        print(f"- {topic_key.upper():6}: {topic_counts.get(topic_key, 0)} items")
+        print(f"- {topic_key.upper():6}: {len(per_topic[topic_key])} items")
+    if scan_stats is None:
+        print("- Rendered from local headline store history (no network); totals cover stored headlines")
+    else:
+        print(
+            f"- Shared scan: {scan_stats['feeds_fetched']}/{scan_stats['feeds_total']} feeds fetched | "
+            f"{scan_stats['duplicate_items_saved']} duplicate items | "
+            f"{scan_stats['near_duplicates_merged']} near-duplicates merged | "
+            f"{scan_stats['inference_saved']} inference calls saved"
+        )
+        rejected = [
+            (scan_stats.get("rejected_out_of_window", 0), "out of window"),
+            (scan_stats.get("rejected_undated", 0), "undated"),
+            (scan_stats.get("rejected_seen", 0), "seen before"),
+            (scan_stats.get("rejected_blocked_source", 0), "from blocked sources"),
+        ]
+        if any(n for n, _ in rejected):
+            print("- Dropped before scoring: " + " | ".join(f"{n} {what}" for n, what in rejected if n))
+        if scan_stats.get("cascade_skipped"):
+            print(
+                f"- Cascade: {scan_stats['items_scored']} items model-scored, "
+                f"{scan_stats['cascade_skipped']} labeled by VADER only "
+                f"(budget {args.cascade}/topic); ranked headlines are model-scored"
+            )
 
     print("\nTOP HIGHLIGHTS (global)")
     if not all_items:
@@ -193,6 +276,277 @@ def main() -> None:
     print()
 
 
+def print_briefing(
+    args: argparse.Namespace,
+    dt_now: datetime,
+    window_label: str,
+    per_topic: Dict[str, List[ScoredItem]],
+    totals: Dict[str, int],
+    scan_stats: Optional[Dict[str, int]],
+) -> None:
+    print_header(args, dt_now, window_label)
+    for topic_key in TOPICS.keys():
+        print_topic_block(topic_key, per_topic[topic_key], args.topk)
+    print_summary(args, per_topic, totals, scan_stats)
+
+
+def log_briefing(
+    log: Optional[DailyLogWriter],
+    args: argparse.Namespace,
+    dt_now: datetime,
+    window_label: str,
+    per_topic: Dict[str, List[ScoredItem]],
+    totals: Dict[str, int],
+    scan_stats: Optional[Dict[str, int]],
+) -> None:
+    # What was shown, as one daily-log record (the scored items are logged by the scan)
+    if log is None:
+        return
+    log.log_event(
+        "briefing",
+        at=dt_now.isoformat(timespec="seconds"),
+        mode=args.mode,
+        window=window_label,
+        totals=totals,
+        topics={k: [it.link for it in v[: args.topk]] for k, v in per_topic.items()},
+        stats=scan_stats,
+    )
+
+
+def run_streaming(
+    args: argparse.Namespace,
+    known: Optional[MutableMapping[str, ScoredItem]] = None,
+) -> Dict[str, int]:
+    """
+    Scan and render in one go: the header prints right away and each topic
+    block as soon as its topic is scored (in TOPICS order), while the
+    remaining feeds keep downloading and the next topic is prepared on the
+    scanner's prepare-ahead thread. KEY METRICS and TOP HIGHLIGHTS follow
+    once every topic is in.
+    """
+    t0 = time.perf_counter()
+    dt_now = now_et()
+    start_dt, end_dt, window_label = mode_window(args.mode, dt_now)
+    store = get_store()
+    log = get_log_writer()
+    limit = max(args.topk, 10)
+
+    if args.clear:
+        clear_screen()
+    print_header(args, dt_now, window_label)
+
+    per_topic: Dict[str, List[ScoredItem]] = {}
+    totals = {"Positive": 0, "Negative": 0, "Neutral": 0}
+    scan_stats: Dict[str, int] = {}
+    render_s = 0.0
+    scans = iter_scan_topics(
+        list(TOPICS.keys()),
+        top_k=limit,
+        use_snippet=True,
+        item_filter=build_filter(args, start_dt, end_dt, store, known),
+        known=known,
+        store=store,
+        log=log,
+        cascade_budget=args.cascade,
+        stats=scan_stats,
+    )
+    while True:
+        with profiling.span("briefing.scan"):
+            scan = next(scans, None)
+        if scan is None:
+            break
+        topic_key, items, counts = scan
+
+        t_render = time.perf_counter()
+        per_topic[topic_key] = items
+        _add_totals(totals, counts)
+        with profiling.span("briefing.render"):
+            print_topic_block(topic_key, items, args.topk)
+            sys.stdout.flush()
+        if "first_topic_ms" not in scan_stats:
+            scan_stats["first_topic_ms"] = int(1000 * (time.perf_counter() - t0))
+        render_s += time.perf_counter() - t_render
+
+    t_render = time.perf_counter()
+    with profiling.span("briefing.render"):
+        print_summary(args, per_topic, totals, scan_stats)
+    scan_stats["render_ms"] = int(1000 * (render_s + time.perf_counter() - t_render))
+    log_briefing(log, args, dt_now, window_label, per_topic, totals, scan_stats)
+    return scan_stats
+
+
+def run_once(
+    args: argparse.Namespace,
+    known: Optional[MutableMapping[str, ScoredItem]] = None,
+    render_unchanged: bool = True,
+) -> Dict[str, int]:
+    if render_unchanged:
+        return run_streaming(args, known)
+
+    # Watch cycles only redraw when something new arrived, which isn't
+    # known until every topic is scanned
+    dt_now = now_et()
+    start_dt, end_dt, window_label = mode_window(args.mode, dt_now)
+
+    store = get_store()
+    log = get_log_writer()
+
+    # One shared pass: each feed fetched once, each unique headline scored once
+    with profiling.span("briefing.scan"):
+        scans, scan_stats = scan_all_topics(
+            list(TOPICS.keys()),
+            top_k=max(args.topk, 10),
+            use_snippet=True,
+            item_filter=build_filter(args, start_dt, end_dt, store, known),
+            known=known,
+            store=store,
+            log=log,
+            cascade_budget=args.cascade,
+        )
+
+    scan_stats["render_ms"] = 0
+    if scan_stats["items_new"]:
+        if args.clear:
+            clear_screen()
+        with profiling.span("briefing.collect"):
+            per_topic, totals = collect_window(scans)
+        t0 = time.perf_counter()
+        with profiling.span("briefing.render"):
+            print_briefing(args, dt_now, window_label, per_topic, totals, scan_stats)
+        scan_stats["render_ms"] = int(1000 * (time.perf_counter() - t0))
+        log_briefing(log, args, dt_now, window_label, per_topic, totals, scan_stats)
+    return scan_stats
+
+
+def run_from_store(args: argparse.Namespace) -> None:
+    store = get_store()
+    if store is None:
+        raise SystemExit("Headline store is disabled (HEADLINE_STORE=0); nothing to render.")
+
+    if args.clear:
+        clear_screen()
+    dt_now = now_et()
+    start_dt, end_dt, window_label = mode_window(args.mode, dt_now)
+    per_topic, totals = collect_window_from_store(store, start_dt, end_dt, max(args.topk, 10), args.keep_undated)
+    print_briefing(args, dt_now, f"{window_label} | stored history", per_topic, totals, None)
+
+
+def run_watch(args: argparse.Namespace) -> None:
+    """
+    Keep the process (and the model) alive and re-poll every args.watch seconds.
+
+    A bounded link -> ScoredItem map remembers what was already scored, so
+    each cycle only runs inference on new arrivals. The briefing is redrawn
+    only when something new shows up; otherwise we print a one-line tick.
+    """
+    known: LRUDict = LRUDict(WATCH_MAX_SEEN)
+    # A fresh cached copy would hide anything published since, and the TTL
+    # is longer than a typical interval; 304s keep revalidation cheap
+    feeds.set_cache_ttl(0)
+
+    # Pay model load once, up front, and report it
+    t0 = time.perf_counter()
+    get_backend()
+    print(f"[watch] model ready in {time.perf_counter() - t0:.2f}s | interval {args.watch}s | Ctrl-C to stop")
+
+    cycle = 0
+    try:
+        while True:
+            cycle += 1
+            t_cycle = time.perf_counter()
+            stats = run_once(args, known, render_unchanged=cycle == 1)
+            total_ms = int(1000 * (time.perf_counter() - t_cycle))
+
+            print(
+                f"[watch] cycle {cycle} {now_et().strftime('%H:%M:%S')} | "
+                f"{stats['items_new']} new / {stats['items_reused']} seen | "
+                f"fetch {stats['fetch_ms']}ms prep {stats['prep_ms']}ms "
+                f"score {stats['score_ms']}ms render {stats['render_ms']}ms | total {total_ms}ms"
+            )
+
+            time.sleep(max(0.0, args.watch - total_ms / 1000.0))
+    except KeyboardInterrupt:
+        print("\n[watch] stopped")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", default="auto", choices=["auto", "preopen", "last24"])
+    parser.add_argument("--clear", action="store_true")
+    parser.add_argument("--topk", type=int, default=6)
+    parser.add_argument(
+        "--watch",
+        type=float,
+        default=0,
+        metavar="INTERVAL",
+        help="keep running and re-poll every INTERVAL seconds (model stays loaded)",
+    )
+    parser.add_argument(
+        "--from-store",
+        action="store_true",
+        help="render from the local headline store without fetching or scoring",
+    )
+    parser.add_argument(
+        "--keep-undated",
+        action=argparse.BooleanOptionalAction,
+        default=WINDOW_KEEP_UNDATED,
+        help="keep headlines without a parsable date in the time window",
+    )
+    parser.add_argument(
+        "--block-source",
+        action="append",
+        default=list(BLOCKED_SOURCES),
+        metavar="NAME",
+        help="drop headlines from this publisher before scoring (repeatable; adds to BLOCKED_SOURCES)",
+    )
+    parser.add_argument(
+        "--new-only",
+        action="store_true",
+        help="only headlines not already in the store (or seen in earlier watch cycles); skips scoring the rest",
+    )
+    parser.add_argument(
+        "--cascade",
+        type=int,
+        nargs="?",
+        const=CASCADE_BUDGET_PER_TOPIC,
+        default=CASCADE_BUDGET_PER_TOPIC if CASCADE_ENABLED else None,
+        metavar="BUDGET",
+        help="VADER pre-ranks every headline; only the top BUDGET per topic reach the model",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="PATH",
+        help="time each stage; print a table, or write JSON to PATH",
+    )
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+
+    if args.profile:
+        profiling.reset()
+        profiling.enable()
+
+    try:
+        with profiling.span("briefing.total"):
+            if args.from_store:
+                run_from_store(args)
+            elif args.watch > 0:
+                run_watch(args)
+            else:
+                run_once(args)
+    finally:
+        if args.profile == "-":
+            print()
+            print(profiling.format_table())
+        elif args.profile:
+            profiling.write_json(args.profile)
+
+
 if __name__ == "__main__":
     main()
 
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Mapping, Optional, Sequence, Set
+
+from .config import CASCADE_BUDGET_PER_TOPIC, SentimentResult
+from .sentiment import SentimentBackend, VaderBackend, get_backend, predict_sentiment_batch
+
+# Cascade scoring.
+#
+# The briefing only shows the top few headlines per topic, ranked by model
+# confidence, yet every deduped headline used to go through the transformer.
+# In cascade mode VADER scores everything first (through the sentiment cache,
+# so repeats are free) and only the `budget` most polarized candidates per
+# topic are sent to the transformer. Those carry the final labels and are the
+# only ones ranked for display; the rest contribute their VADER label to the
+# sentiment counts.
+
+_PRERANKER: Optional[VaderBackend] = None
+_PRERANKER_LOCK = threading.Lock()
+
+
+def get_preranker() -> Optional[VaderBackend]:
+    global _PRERANKER
+    with _PRERANKER_LOCK:
+        if _PRERANKER is None:
+            try:
+                _PRERANKER = VaderBackend()
+            except Exception:
+                return None
+    return _PRERANKER
+
+
+def cascade_applies(budget: Optional[int]) -> bool:
+    # Pointless when the main backend already is VADER (model didn't load)
+    if budget is None or budget <= 0 or get_preranker() is None:
+        return False
+    return get_backend().name != VaderBackend.name
+
+
+def prerank(texts: Sequence[str]) -> List[SentimentResult]:
+    preranker = get_preranker()
+    if preranker is None:
+        return [SentimentResult("Neutral", 1.0)] * len(texts)
+    return predict_sentiment_batch(texts, backend=preranker)
+
+
+def signal_strength(r: SentimentResult) -> float:
+    """
+    |compound| of a VADER result. VADER's Neutral confidence is
+    1 - |compound|, so ranking on raw confidence would favour the blandest
+    headlines over clearly polarized ones.
+    """
+    return 1.0 - r.confidence if r.label == "Neutral" else r.confidence
+
+
+def select_candidates(
+    keys_by_topic: Mapping[str, Sequence[str]],
+    prescores: Mapping[str, SentimentResult],
+    budget: int = CASCADE_BUDGET_PER_TOPIC,
+) -> Set[str]:
+    """
+    Keys (links) to send to the transformer: the `budget` strongest
+    pre-ranker signals in each topic. A key picked by any topic is picked once.
+    """
+    picked: Set[str] = set()
+    for keys in keys_by_topic.values():
+        ranked = sorted(keys, key=lambda k: signal_strength(prescores[k]), reverse=True)
+        picked.update(ranked[:budget])
+    return picked
+
+
+# ==========================
+# Quality vs. cost report
+# ==========================
+def evaluate_cascade(
+    texts_by_topic: Mapping[str, Sequence[str]],
+    budget: int = CASCADE_BUDGET_PER_TOPIC,
+    top_k: int = 6,
+) -> Dict[str, object]:
+    """
+    Run both the full path (transformer on everything) and the cascade on
+    the same headlines and compare them: label agreement over all items,
+    overlap of each topic's displayed top_k, and how much transformer work
+    the cascade skipped. Inference is timed without the sentiment cache.
+    """
+    backend: SentimentBackend = get_backend()
+    preranker = get_preranker()
+    if preranker is None:
+        raise RuntimeError("cascade needs vaderSentiment for the pre-ranker")
+    topics = {k: list(dict.fromkeys(t for t in v if t)) for k, v in texts_by_topic.items()}
+    unique = list(dict.fromkeys(t for v in topics.values() for t in v))
+    if not unique:
+        return {"items": 0}
+
+    t0 = time.perf_counter()
+    full = dict(zip(unique, backend.predict_batch(unique)))
+    full_ms = 1000 * (time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    pre = dict(zip(unique, preranker.predict_batch(unique)))
+    picked = select_candidates(topics, pre, budget)
+    picked_list = [t for t in unique if t in picked]
+    backend.predict_batch(picked_list)
+    cascade_ms = 1000 * (time.perf_counter() - t0)
+
+    final = {t: (full[t] if t in picked else pre[t]) for t in unique}
+    agree = sum(final[t].label == full[t].label for t in unique)
+    agree_cheap = sum(pre[t].label == full[t].label for t in unique if t not in picked)
+
+    def top(texts: Sequence[str]) -> List[str]:
+        return sorted(texts, key=lambda t: full[t].confidence, reverse=True)[:top_k]
+
+    overlaps: List[float] = []
+    for texts in topics.values():
+        if not texts:
+            continue
+        want = top(texts)
+        got = top([t for t in texts if t in picked])
+        overlaps.append(len(set(want) & set(got)) / len(want))
+
+    n_cheap = len(unique) - len(picked_list)
+    return {
+        "backend": backend.name,
+        "budget_per_topic": budget,
+        "items": len(unique),
+        "sent_to_model": len(picked_list),
+        "inference_saved_pct": round(100.0 * n_cheap / len(unique), 1),
+        "label_agreement": round(agree / len(unique), 4),
+        "prerank_label_agreement": round(agree_cheap / n_cheap, 4) if n_cheap else None,
+        "topk_overlap": round(sum(overlaps) / len(overlaps), 4) if overlaps else None,
+        "full_ms": round(full_ms, 1),
+        "cascade_ms": round(cascade_ms, 1),
+    }
+
+
+def _scan_texts(use_snippet: bool) -> Dict[str, List[str]]:
+    # Imported here: scanner itself imports this module
+    from .scanner import _cluster, _dedupe_by_link, _text_for, topic_feed_urls
+    from .feeds import fetch_many
+    from .topics import TOPICS
+
+    out: Dict[str, List[str]] = {}
+    for key in TOPICS:
+        items = [it for feed in fetch_many(topic_feed_urls(key)) for it in feed]
+        reps, _ = _cluster(_dedupe_by_link(items), True)
+        out[key] = [_text_for(it, use_snippet)[0] for it in reps]
+    return out
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare cascade scoring against the full transformer path")
+    parser.add_argument("--budget", type=int, default=CASCADE_BUDGET_PER_TOPIC)
+    parser.add_argument("--topk", type=int, default=6)
+    args = parser.parse_args()
+
+    report = evaluate_cascade(_scan_texts(use_snippet=True), budget=args.budget, top_k=args.topk)
+    if not report.get("items"):
+        print("No headlines fetched.")
+        return
+    if report["backend"] == VaderBackend.name:
+        print("Transformer model unavailable (running on VADER); the comparison is trivial.")
+
+    cheap = report["prerank_label_agreement"]
+    print(
+        f"{report['backend']} | budget {report['budget_per_topic']}/topic | "
+        f"{report['sent_to_model']}/{report['items']} items to the model "
+        f"({report['inference_saved_pct']}% saved)"
+    )
+    print(f"- label agreement with full path: {report['label_agreement']:.2%}")
+    if cheap is not None:
+        print(f"- VADER-only items agreeing with the model: {cheap:.2%}")
+    print(f"- top-{args.topk} overlap per topic: {report['topk_overlap']:.2%}")
+    print(f"- inference: full {report['full_ms']:.0f}ms vs cascade {report['cascade_ms']:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
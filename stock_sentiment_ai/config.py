@@ -12,8 +12,39 @@ from typing import Dict, List
 MODEL_NAME = os.getenv("SENTIMENT_MODEL", "ProsusAI/finbert")
 USE_SAFETENSORS = True
 
+# Inference backend for the model above:
+#   "torch"      - fp32 PyTorch (default)
+#   "torch-int8" - PyTorch with dynamic int8 quantization of Linear layers
+#   "onnx"       - exported once to ONNX, run with ONNX Runtime on CPU
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "torch").strip().lower()
+ONNX_EXPORT_DIR = os.getenv("ONNX_EXPORT_DIR", os.path.join(".cache", "onnx"))
+
+# Headlines scored per forward pass. Batches are built from length-sorted
+# texts so padding stays small.
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
+SENTIMENT_MAX_LENGTH = 256
+
+# Multi-process scoring: with SENTIMENT_WORKERS > 1 the model runs in that
+# many worker processes, each with SENTIMENT_WORKER_THREADS torch threads
+# (0 = cores / workers). 0 or 1 keeps scoring in-process.
+SENTIMENT_WORKERS = int(os.getenv("SENTIMENT_WORKERS", "0"))
+SENTIMENT_WORKER_THREADS = int(os.getenv("SENTIMENT_WORKER_THREADS", "0"))
+SENTIMENT_WORKER_START_TIMEOUT_SECS = float(os.getenv("SENTIMENT_WORKER_START_TIMEOUT_SECS", "300"))
+
+# On-disk cache of scored headlines, keyed by backend + text hash.
+# Set SENTIMENT_CACHE=0 to disable.
+SENTIMENT_CACHE_ENABLED = os.getenv("SENTIMENT_CACHE", "1") != "0"
+SENTIMENT_CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH", os.path.join(".cache", "sentiment_cache.sqlite3"))
+SENTIMENT_CACHE_MAX_ENTRIES = int(os.getenv("SENTIMENT_CACHE_MAX_ENTRIES", "50000"))
+
 # If the HF model can't load (offline / blocked), we fall back to VADER automatically.
 
+# Cascade scoring: VADER (cached) scores every item first, and only the top
+# CASCADE_BUDGET_PER_TOPIC candidates per topic go to the transformer. Off by
+# default; SENTIMENT_CASCADE=1 or briefing --cascade turns it on.
+CASCADE_ENABLED = os.getenv("SENTIMENT_CASCADE", "0") == "1"
+CASCADE_BUDGET_PER_TOPIC = int(os.getenv("CASCADE_BUDGET_PER_TOPIC", "24"))
+
 
 # ==========================
 # News scanning
@@ -22,6 +53,55 @@ MAX_ITEMS_PER_FEED = 30
 TOP_K_PER_TOPIC = 6
 REQUEST_TIMEOUT_SECS = 12
 
+# Concurrent feed fetching: total feeds in flight, and per host
+# (every Google News query hits news.google.com, so keep that one polite).
+FEED_FETCH_MAX_WORKERS = int(os.getenv("FEED_FETCH_MAX_WORKERS", "8"))
+FEED_FETCH_MAX_PER_HOST = int(os.getenv("FEED_FETCH_MAX_PER_HOST", "4"))
+# Sent with every feed request; identifies this project to feed hosts
+FEED_USER_AGENT = os.getenv(
+    "FEED_USER_AGENT",
+    "stock_sentiment_ai (+https://github.com/declannoonan290-hub/news-aggregation-tracker)",
+)
+
+# Multi-topic scans prepare (fetch, dedupe, filter, cluster, pre-rank) up to
+# this many topics ahead on a background thread while the current topic is
+# being scored. 0 does everything on the calling thread.
+SCAN_PREPARE_AHEAD = int(os.getenv("SCAN_PREPARE_AHEAD", "1"))
+
+# Local feed cache. Within the TTL a feed is served from disk with no request;
+# after it we send a conditional GET (ETag / Last-Modified) and reuse the
+# cached items on a 304. Watch mode skips the TTL and always revalidates,
+# so each cycle really polls. Set FEED_CACHE=0 to disable.
+FEED_CACHE_ENABLED = os.getenv("FEED_CACHE", "1") != "0"
+FEED_CACHE_DIR = os.getenv("FEED_CACHE_DIR", os.path.join(".cache", "feeds"))
+FEED_CACHE_TTL_SECS = int(os.getenv("FEED_CACHE_TTL_SECS", "300"))
+
+# Well-formed RSS 2.0 (the Google News shape) is read by a streaming parser;
+# anything it isn't sure about goes through feedparser. Set FAST_RSS=0 to
+# always use feedparser.
+FAST_RSS_ENABLED = os.getenv("FAST_RSS", "1") != "0"
+
+# Near-duplicate headline clustering (MinHash over normalized title tokens).
+# Titles with token Jaccard similarity >= threshold count as one story and
+# only one representative per cluster is scored.
+NEARDUP_ENABLED = os.getenv("NEARDUP", "1") != "0"
+NEARDUP_THRESHOLD = float(os.getenv("NEARDUP_THRESHOLD", "0.7"))
+
+# Local SQLite history of scored headlines; briefing windows query it.
+# Set HEADLINE_STORE=0 to disable.
+HEADLINE_STORE_ENABLED = os.getenv("HEADLINE_STORE", "1") != "0"
+HEADLINE_STORE_PATH = os.getenv("HEADLINE_STORE_PATH", os.path.join(".cache", "headlines.sqlite3"))
+
+# --watch mode: how many scored links to remember between cycles
+WATCH_MAX_SEEN = int(os.getenv("WATCH_MAX_SEEN", "20000"))
+
+# Filters applied before scoring. Headlines from publishers listed in
+# BLOCKED_SOURCES (comma-separated, any case) are dropped. With a time
+# window, headlines without a parsable date are kept unless
+# WINDOW_KEEP_UNDATED=0.
+BLOCKED_SOURCES = [s.strip() for s in os.getenv("BLOCKED_SOURCES", "").split(",") if s.strip()]
+WINDOW_KEEP_UNDATED = os.getenv("WINDOW_KEEP_UNDATED", "1") != "0"
+
 # If True, we attempt to use RSS summaries/snippets.
 # We do NOT scrape full article pages by default (safer + fewer ToS issues).
 USE_SNIPPETS = True
@@ -30,9 +110,14 @@ USE_SNIPPETS = True
 # ==========================
 # Logging
 # ==========================
-SAVE_DAILY_LOG = True
-LOG_DIR = "logs"
-KEEP_LOG_DAYS = 10  # keeps last N days of text logs
+# Scored items and briefing summaries go to LOG_DIR/YYYY-MM-DD.jsonl.gz,
+# written by a background thread (see dailylog.py). Set SAVE_DAILY_LOG=0 to
+# disable. Records beyond LOG_QUEUE_MAX pending ones are dropped rather than
+# slowing the scan down.
+SAVE_DAILY_LOG = os.getenv("SAVE_DAILY_LOG", "1") != "0"
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+KEEP_LOG_DAYS = int(os.getenv("KEEP_LOG_DAYS", "10"))  # keeps last N days of logs
+LOG_QUEUE_MAX = int(os.getenv("LOG_QUEUE_MAX", "1000"))
 
 
 # ==========================
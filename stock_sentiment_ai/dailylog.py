@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import re
+import threading
+import zlib
+from datetime import date, timedelta
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from . import profiling
+from .config import KEEP_LOG_DAYS, LOG_DIR, LOG_QUEUE_MAX, SAVE_DAILY_LOG
+from .scanner import ScoredItem
+from .util import ensure_dir, today_ymd_local, utc_now
+
+# Daily logs: one gzip-compressed JSONL file per local day in LOG_DIR
+# (LOG_DIR/2026-01-05.jsonl.gz), one record per line with "kind" first:
+#
+#   {"kind":"item","ts":...,"topic":"gold","label":"Positive",...}
+#   {"kind":"briefing","ts":...,"mode":"auto","totals":{...},...}
+#
+# Callers only enqueue (items are immutable, so no copies); a background
+# thread serializes, compresses and writes. The queue is bounded and a full
+# queue drops the record instead of blocking the scan. Each process run
+# appends its own gzip member, which gzip readers read through as one
+# stream. A run that dies leaves its member without a trailer; the next run
+# then starts a new file for the day (2026-01-05.1.jsonl.gz, ...) instead of
+# appending behind it. Files older than KEEP_LOG_DAYS days are pruned at each
+# day change.
+
+_FILE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.jsonl\.gz$")
+_GZIP_MAGIC = b"\x1f\x8b\x08"
+_SYNC_FLUSH_MARK = b"\x00\x00\xff\xff"
+_READ_BLOCK = 1 << 16
+_STOP = object()
+
+
+def _item_record(topic: str, ts: str, it: ScoredItem) -> Dict[str, object]:
+    return {
+        "kind": "item",
+        "ts": ts,
+        "topic": topic,
+        "label": it.label,
+        "confidence": round(float(it.confidence), 6),
+        "title": it.title,
+        "link": it.link,
+        "source": it.source,
+        "author": it.author,
+        "published": it.published_dt.isoformat() if it.published_dt else None,
+        "published_raw": it.published_raw,
+        "used": it.used,
+        "cluster_size": it.cluster_size,
+    }
+
+
+class DailyLogWriter:
+    def __init__(
+        self,
+        log_dir: str = LOG_DIR,
+        keep_days: int = KEEP_LOG_DAYS,
+        max_queue: int = LOG_QUEUE_MAX,
+    ) -> None:
+        self.log_dir = log_dir
+        self.keep_days = max(1, int(keep_days))
+        self.dropped = 0
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._day: Optional[str] = None
+        self._file: Optional[TextIO] = None
+        self._closed = False
+        ensure_dir(log_dir)
+        self._thread = threading.Thread(target=self._run, name="daily-log", daemon=True)
+        self._thread.start()
+
+    # ---- producer side (scan / render threads) ----
+    def _put(self, entry: Tuple[str, ...]) -> bool:
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            profiling.count("log.dropped")
+            return False
+
+    def log_items(self, topic: str, items: Sequence[ScoredItem]) -> bool:
+        """Queue scored items for `topic`; False if the queue was full."""
+        if not items:
+            return True
+        return self._put(("items", utc_now().isoformat(timespec="seconds"), topic, tuple(items)))
+
+    def log_event(self, kind: str, **fields: object) -> bool:
+        """Queue one record of any `kind` (fields must be JSON-serializable)."""
+        return self._put(("event", utc_now().isoformat(timespec="seconds"), kind, fields))
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Write out whatever is queued and close the current file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    # ---- writer thread ----
+    def _records(self, entry: Tuple[str, ...]) -> Iterator[Dict[str, object]]:
+        if entry[0] == "items":
+            _, ts, topic, items = entry
+            for it in items:
+                yield _item_record(topic, ts, it)
+        else:
+            _, ts, kind, fields = entry
+            yield {"kind": kind, "ts": ts, **fields}
+
+    def _open_today(self) -> TextIO:
+        day = today_ymd_local()
+        if self._file is None or day != self._day:
+            if self._file is not None:
+                self._file.close()
+            self._day = day
+            self._file = gzip.open(_writable_log_path(self.log_dir, day), "at", encoding="utf-8")
+            prune_logs(self.log_dir, self.keep_days)
+        return self._file
+
+    def _write(self, entry: Tuple[str, ...]) -> None:
+        f = self._open_today()
+        for rec in self._records(entry):
+            f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":"), default=str))
+            f.write("\n")
+
+    def _run(self) -> None:
+        while True:
+            entry = self._queue.get()
+            try:
+                # Drain whatever else is waiting, then sync-flush once, so a
+                # crash loses at most the batch in flight
+                while entry is not _STOP:
+                    try:
+                        self._write(entry)  # type: ignore[arg-type]
+                    except Exception:
+                        profiling.count("log.errors")
+                    try:
+                        entry = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if self._file is not None:
+                    if entry is _STOP:
+                        self._file.close()
+                        self._file = None
+                    else:
+                        self._file.flush()
+                        self._file.buffer.flush(zlib.Z_SYNC_FLUSH)  # type: ignore[attr-defined]
+            except Exception:
+                profiling.count("log.errors")
+            if entry is _STOP:
+                return
+
+
+def _log_files(log_dir: str) -> List[Tuple[str, str]]:
+    """(day, path) for every daily log in `log_dir`, oldest first."""
+    try:
+        names = os.listdir(log_dir)
+    except FileNotFoundError:
+        return []
+    out = []
+    for name in names:
+        m = _FILE_RE.match(name)
+        if m:
+            out.append((m.group(1), int(m.group(2) or 0), os.path.join(log_dir, name)))
+    return [(day, path) for day, _, path in sorted(out)]
+
+
+def _writable_log_path(log_dir: str, day: str) -> str:
+    """
+    The file to append `day`'s records to: the newest one for that day,
+    unless its last gzip member is unfinished (a crashed or still-running
+    writer), in which case the next numbered file.
+    """
+    paths = [path for d, path in _log_files(log_dir) if d == day]
+    if paths and _gzip_complete(paths[-1]):
+        return paths[-1]
+    if not paths:
+        return os.path.join(log_dir, f"{day}.jsonl.gz")
+    n = max(int(_FILE_RE.match(os.path.basename(p)).group(2) or 0) for p in paths)  # type: ignore[union-attr]
+    return os.path.join(log_dir, f"{day}.{n + 1}.jsonl.gz")
+
+
+def _gzip_complete(path: str) -> bool:
+    # Writers sync-flush after every batch, so a member whose writer died
+    # (or is still running) ends at a flush point; a closed one ends in its
+    # trailer instead. Only the tail is read, however big the file.
+    try:
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - len(_SYNC_FLUSH_MARK)))
+            return not f.read().endswith(_SYNC_FLUSH_MARK)
+    except FileNotFoundError:
+        return True
+
+
+def _read_block(f: BinaryIO) -> bytes:
+    block = f.read(_READ_BLOCK)
+    # Never split a possible member header across two blocks
+    while block.endswith((b"\x1f", b"\x1f\x8b")):
+        more = f.read(2)
+        if not more:
+            break
+        block += more
+    return block
+
+
+def _find_member(f: BinaryIO, start: int) -> int:
+    f.seek(start)
+    at = start
+    while True:
+        block = _read_block(f)
+        if not block:
+            return -1
+        i = block.find(_GZIP_MAGIC)
+        if i >= 0:
+            return at + i
+        at += len(block)
+
+
+def _iter_members(f: BinaryIO) -> Iterator[bytes]:
+    """
+    Decompressed chunks of every gzip member in `f`, read in fixed-size
+    blocks. A member that is cut short or damaged yields what could be read
+    and then b"", and reading resumes at the next member header.
+    """
+    pos = _find_member(f, 0)
+    while pos >= 0:
+        d = zlib.decompressobj(wbits=31)
+        seg = at = pos  # seg: where the piece being fed starts a new segment
+        end = -1
+        f.seek(pos)
+        try:
+            while not d.eof:
+                block = _read_block(f)
+                if not block:
+                    break
+                view = memoryview(block)
+                i = 0
+                # Feed up to each possible member header, so a header
+                # appended behind an unfinished member is where decoding fails
+                while i < len(block) and not d.eof:
+                    if block.startswith(_GZIP_MAGIC, i):
+                        seg = at + i
+                    j = block.find(_GZIP_MAGIC, i + 1)
+                    j = len(block) if j < 0 else j
+                    buf = view[i:j]
+                    while buf and not d.eof:
+                        out = d.decompress(buf, 1 << 20)
+                        if out:
+                            yield out
+                        buf = d.unconsumed_tail
+                    if d.eof:
+                        end = at + j - len(d.unused_data)
+                    i = j
+                at += len(block)
+        except zlib.error:
+            end = seg if seg > pos else pos + 1
+        if not d.eof:
+            yield b""
+            if end < 0:
+                return
+        pos = _find_member(f, end)
+
+
+def _iter_lines(path: str) -> Iterator[bytes]:
+    tail = b""
+    with open(path, "rb") as f:
+        for chunk in _iter_members(f):
+            if not chunk:
+                # The rest of a record cut off mid-write never arrives
+                tail = b""
+                continue
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            yield from lines
+
+
+def prune_logs(log_dir: str = LOG_DIR, keep_days: int = KEEP_LOG_DAYS, today: Optional[str] = None) -> int:
+    """Delete daily logs older than the last `keep_days` days (today included)."""
+    cutoff = (date.fromisoformat(today or today_ymd_local()) - timedelta(days=max(1, keep_days) - 1)).isoformat()
+    removed = 0
+    for day, path in _log_files(log_dir):
+        if day < cutoff:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def iter_log_records(
+    log_dir: str = LOG_DIR,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    kinds: Optional[Iterable[str]] = None,
+) -> Iterator[Dict[str, object]]:
+    """
+    Stream records from the daily logs, oldest day first. `since` / `until`
+    are inclusive YYYY-MM-DD days; `kinds` keeps only those record kinds
+    (checked on the raw line before JSON decoding). A gzip member left
+    unfinished by a crash yields every record that reached the disk, and
+    reading carries on with the members after it.
+    """
+    wanted = None
+    if kinds is not None:
+        wanted = tuple(f'{{"kind":{json.dumps(k)},'.encode("utf-8") for k in kinds)
+
+    for day, path in _log_files(log_dir):
+        if (since and day < since) or (until and day > until):
+            continue
+        try:
+            for line in _iter_lines(path):
+                if wanted is not None and not line.startswith(wanted):
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+        except OSError:
+            continue
+
+
+_WRITER: Optional[DailyLogWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_log_writer() -> Optional[DailyLogWriter]:
+    global _WRITER
+    if not SAVE_DAILY_LOG:
+        return None
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            try:
+                _WRITER = DailyLogWriter()
+            except Exception:
+                return None
+            atexit.register(_WRITER.close)
+    return _WRITER
+
+
+def main() -> None:
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Stream records from the daily logs as JSONL")
+    parser.add_argument("--dir", default=LOG_DIR)
+    parser.add_argument("--since", metavar="YYYY-MM-DD")
+    parser.add_argument("--until", metavar="YYYY-MM-DD")
+    parser.add_argument("--kind", action="append", help="only records of this kind (repeatable)")
+    parser.add_argument("--count", action="store_true", help="print record counts per kind instead")
+    args = parser.parse_args()
+
+    records = iter_log_records(args.dir, args.since, args.until, args.kind)
+    if args.count:
+        counts: Dict[str, int] = {}
+        for rec in records:
+            kind = str(rec.get("kind"))
+            counts[kind] = counts.get(kind, 0) + 1
+        for kind in sorted(counts):
+            print(f"{kind:12} {counts[kind]}")
+        return
+
+    out = sys.stdout
+    try:
+        for rec in records:
+            out.write(json.dumps(rec, ensure_ascii=False))
+            out.write("\n")
+    except BrokenPipeError:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from .config import TRADE_WATCHLIST
+from .insiders_sec import (
+    Form4Filing,
+    _form4_from_recent,
+    _load_submissions_state,
+    _save_submissions_state,
+    lookup_ciks,
+)
+from .topics import TOPICS
+
+# Offline bulk ingestion from SEC's nightly submissions.zip
+# (https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip).
+#
+# The archive holds one CIK##########.json per filer, shaped like the
+# data.sec.gov submissions API, plus CIK##########-submissions-NNN.json pages
+# with older filings. We read it in place, decode only the members for CIKs on
+# our watchlist, and merge them into the same per-CIK Form 4 state that
+# insiders_sec uses, so fetch_recent_form4_filings answers from it directly.
+# Filings already polled (possibly newer than the archive) and the polling
+# validators are kept; CIKs with no members in the archive are left alone.
+
+_MEMBER = re.compile(r"^CIK(\d{10})(?:-submissions-(\d+))?\.json$")
+
+
+def watchlist_tickers() -> List[str]:
+    tickers: List[str] = []
+    for topic in TOPICS.values():
+        tickers.extend(topic.get("tickers", []))
+    for group in TRADE_WATCHLIST.values():
+        tickers.extend(group)
+    return sorted({t.upper() for t in tickers})
+
+
+def ingest_submissions_zip(
+    zip_path: str,
+    tickers: Optional[Iterable[str]] = None,
+    ciks: Optional[Iterable[str]] = None,
+) -> Dict[str, int]:
+    """
+    Build the local Form 4 index for watchlist CIKs from submissions.zip.
+
+    `ciks` are 10-digit CIK strings; `tickers` are resolved through the
+    ticker index. With neither, the topic and trade watchlists are used.
+    Returns simple counters describing the pass.
+    """
+    wanted: Set[str] = {f"{int(c):010d}" for c in (ciks or [])}
+    if tickers is not None or not wanted:
+        resolved = lookup_ciks(tickers if tickers is not None else watchlist_tickers())
+        wanted.update(c for c in resolved.values() if c)
+
+    by_cik: Dict[str, List[Form4Filing]] = {}
+    members_read = 0
+
+    with zipfile.ZipFile(zip_path) as zf:
+        # One pass over the central directory picks out our members; nothing
+        # else is decompressed.
+        members = []
+        for info in zf.infolist():
+            m = _MEMBER.match(info.filename)
+            if m and m.group(1) in wanted:
+                members.append((m.group(1), int(m.group(2) or 0), info))
+
+        # Main CIK file first, then its pages in order. Each is newest first,
+        # so appending keeps the whole list newest first.
+        members.sort(key=lambda x: (x[0], x[1]))
+
+        for cik10, _, info in members:
+            with zf.open(info) as f:
+                js = json.load(f)
+            members_read += 1
+
+            # Main file nests the arrays under filings.recent; pages are flat
+            recent = (js.get("filings", {}) or {}).get("recent") if "filings" in js else js
+            by_cik.setdefault(cik10, []).extend(_form4_from_recent(cik10, recent or {}))
+
+    now = time.time()
+    n_filings = 0
+    for cik10, filings in by_cik.items():
+        state = _load_submissions_state(cik10) or {
+            "checked_at": now,
+            "etag": "",
+            "last_modified": "",
+            "source": "bulk",
+        }
+        known = [Form4Filing(**f) for f in state.get("filings", [])]
+        seen = {f.accession for f in known}
+        for f in filings:
+            if f.accession not in seen:
+                seen.add(f.accession)
+                known.append(f)
+        n_filings += len(known)
+        # Newest first; on the same day, already-known filings stay ahead
+        known.sort(key=lambda f: f.filing_date, reverse=True)
+
+        state["last_accession"] = known[0].accession if known else state.get("last_accession", "")
+        state["filings"] = [{"filing_date": f.filing_date, "url": f.url, "accession": f.accession} for f in known]
+        _save_submissions_state(cik10, state)
+
+    return {
+        "ciks": len(wanted),
+        "ciks_found": len(by_cik),
+        "members_read": members_read,
+        "form4_filings": n_filings,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the local Form 4 index from submissions.zip")
+    parser.add_argument("zip_path")
+    parser.add_argument("--tickers", nargs="*", default=None)
+    args = parser.parse_args()
+
+    if not Path(args.zip_path).exists():
+        raise SystemExit(f"No such file: {args.zip_path}")
+
+    t0 = time.time()
+    stats = ingest_submissions_zip(args.zip_path, tickers=args.tickers)
+    print(
+        f"Indexed {stats['form4_filings']} Form 4 filings for {stats['ciks_found']}/{stats['ciks']} CIKs "
+        f"from {stats['members_read']} archive members in {time.time() - t0:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,41 @@
 from __future__ import annotations
 
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
-from typing import List, Optional
-from urllib.parse import quote_plus
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote_plus, urlsplit
+from xml.etree.ElementTree import ParseError, iterparse
 
 import feedparser
+import requests
+from requests.adapters import HTTPAdapter
 
+from . import profiling
+from .config import (
+    FAST_RSS_ENABLED,
+    FEED_CACHE_DIR,
+    FEED_CACHE_ENABLED,
+    FEED_CACHE_TTL_SECS,
+    FEED_FETCH_MAX_PER_HOST,
+    FEED_FETCH_MAX_WORKERS,
+    FEED_USER_AGENT,
+    REQUEST_TIMEOUT_SECS,
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class FeedItem:
     title: str
     link: str
@@ -19,6 +45,12 @@ class FeedItem:
     published_raw: str
     published_dt: Optional[datetime]
 
+    def __post_init__(self) -> None:
+        # A feed repeats a handful of publishers/authors across every item;
+        # keep one copy of each string instead of one per item.
+        self.source = sys.intern(self.source)
+        self.author = sys.intern(self.author)
+
 
 def google_news_rss_url(query: str) -> str:
     q = quote_plus(query)
@@ -68,10 +100,13 @@ def _best_effort_published(entry) -> tuple[str, Optional[datetime]]:
     if not raw:
         return "", None
 
-    # RFC822 dates usually parse cleanly here
+    # RFC822 dates usually parse cleanly here. "-0000" (UTC, source zone
+    # unknown) comes back naive; treat it as UTC so every date is comparable.
     try:
         dt = parsedate_to_datetime(raw)
         if dt is not None:
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
             return raw, dt
     except Exception:
         pass
@@ -79,11 +114,9 @@ def _best_effort_published(entry) -> tuple[str, Optional[datetime]]:
     return raw, None
 
 
-def fetch_rss(url: str) -> List[FeedItem]:
-    feed = feedparser.parse(url)
-
+def _items_from_entries(entries) -> List[FeedItem]:
     out: List[FeedItem] = []
-    for e in feed.entries:
+    for e in entries:
         title = str(e.get("title", "")).strip()
         link = str(e.get("link", "")).strip()
         summary = str(e.get("summary", "") or "").strip()
@@ -108,3 +141,373 @@ def fetch_rss(url: str) -> List[FeedItem]:
         )
 
     return out
+
+
+# ==========================
+# Fast-path RSS 2.0 parser
+# ==========================
+# Google News serves one fixed RSS 2.0 shape. We stream it with expat
+# (iterparse) straight into FeedItems and only accept input we can read
+# exactly as feedparser would; anything else raises _Unsupported and the
+# whole document goes through feedparser instead.
+
+class _Unsupported(Exception):
+    pass
+
+
+# Item children we know how to read (or can safely ignore). Anything else,
+# e.g. <author> or <dc:creator>, could change what feedparser reports.
+_RSS_ITEM_CHILDREN = {"title", "link", "guid", "pubDate", "description", "source", "category", "comments"}
+_RSS_SINGLE_FIELDS = ("title", "link", "pubDate", "description", "source")
+
+# Character references that feedparser may rewrite in plain-text fields
+_ENTITYISH = re.compile(r"&(?:#\d+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);")
+
+# Google News descriptions: an anchor to the story plus the publisher in a
+# grey <font>, sometimes as an <ol><li> list of related stories. feedparser's
+# sanitizer leaves exactly these tokens untouched, apart from turning &#39;
+# into an apostrophe.
+_DESC_TOKEN = re.compile(
+    r'(<a href="(?:[^"<>&]|&amp;)*" target="_blank">|</a>|<font color="#6f6f6f">|</font>|<ol>|</ol>|<li>|</li>)'
+    r"|(?:[^<>&]|&(?:nbsp|amp|quot|lt|gt|#39);)+"
+)
+
+
+def _plain_text(s: str) -> str:
+    if "<" in s or _ENTITYISH.search(s):
+        raise _Unsupported("markup in text field")
+    return s
+
+
+def _google_summary(desc: str) -> str:
+    open_tags: List[str] = []
+    pos = 0
+    while pos < len(desc):
+        m = _DESC_TOKEN.match(desc, pos)
+        if m is None:
+            raise _Unsupported("unexpected description markup")
+        tag = m.group(1)
+        if tag:
+            if tag.startswith("</"):
+                if not open_tags or open_tags.pop() != tag[2:-1]:
+                    raise _Unsupported("unbalanced description markup")
+            else:
+                name = tag[1:].split(" ", 1)[0].rstrip(">")
+                if name in open_tags and name != "li":
+                    raise _Unsupported("nested description markup")
+                open_tags.append(name)
+        pos = m.end()
+    if open_tags:
+        raise _Unsupported("unbalanced description markup")
+    return desc.replace("&#39;", "'")
+
+
+def _item_from_rss(elem) -> Optional[FeedItem]:
+    fields: Dict[str, str] = {}
+    has_source = False
+    for child in elem:
+        tag = child.tag
+        if tag not in _RSS_ITEM_CHILDREN or len(child):
+            raise _Unsupported(f"item child <{tag}>")
+        if tag in _RSS_SINGLE_FIELDS:
+            if tag in fields:
+                raise _Unsupported(f"repeated <{tag}>")
+            fields[tag] = child.text or ""
+        has_source = has_source or tag == "source"
+
+    title = _plain_text(fields.get("title", "")).strip()
+    link = fields.get("link", "").strip()
+    if not title:
+        return None
+    if not link.startswith(("http://", "https://")):
+        raise _Unsupported("missing or relative link")
+
+    source = _plain_text(fields.get("source", "")).strip() if has_source else ""
+    if not source:
+        # Same " - Publisher" fallback the feedparser path uses
+        source = _best_effort_source({"title": title})
+
+    published_raw, published_dt = _best_effort_published({"published": fields.get("pubDate", "")})
+    return FeedItem(
+        title=title,
+        link=link,
+        source=source,
+        summary=_google_summary(fields.get("description", "")).strip(),
+        author="",
+        published_raw=published_raw,
+        published_dt=published_dt,
+    )
+
+
+def _iter_rss_items(content: bytes) -> Iterator[FeedItem]:
+    depth = 0
+    for event, elem in iterparse(io.BytesIO(content), events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 1 and (elem.tag != "rss" or not elem.get("version", "").startswith("2.")):
+                raise _Unsupported("not RSS 2.x")
+            if depth == 2 and elem.tag != "channel":
+                raise _Unsupported(f"unexpected <{elem.tag}>")
+            if depth > 2 and elem.tag == "item" and depth != 3:
+                raise _Unsupported("misplaced <item>")
+            continue
+
+        depth -= 1
+        if depth == 2 and elem.tag == "item":
+            it = _item_from_rss(elem)
+            if it is not None:
+                yield it
+        if depth == 2:
+            # Done with this channel child; keep memory flat on large feeds
+            elem.clear()
+
+
+def _parse_rss_fast(content: bytes) -> Optional[List[FeedItem]]:
+    try:
+        return list(_iter_rss_items(content))
+    except (_Unsupported, ParseError):
+        return None
+
+
+def parse_rss(content: bytes, fast: bool = FAST_RSS_ENABLED) -> List[FeedItem]:
+    """FeedItems from a feed document: fast path when it applies, else feedparser."""
+    if fast:
+        with profiling.span("feed.parse_fast"):
+            items = _parse_rss_fast(content)
+        if items is not None:
+            profiling.count("feed.parsed_fast")
+            return items
+        profiling.count("feed.parser_fallback")
+
+    with profiling.span("feed.parse_feedparser"):
+        return _items_from_entries(feedparser.parse(content).entries)
+
+
+# ==========================
+# Download
+# ==========================
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, FEED_FETCH_MAX_WORKERS))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = FEED_USER_AGENT
+            _SESSION = session
+    return _SESSION
+
+
+def _download(
+    url: str,
+    etag: Optional[str] = None,
+    modified: Optional[str] = None,
+) -> Tuple[Optional[int], bytes, str, str]:
+    """(status, body, etag, last_modified); status is None when the request failed."""
+    headers: Dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+    try:
+        r = _get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT_SECS)
+    except requests.RequestException:
+        return None, b"", "", ""
+    return r.status_code, r.content, r.headers.get("ETag", ""), r.headers.get("Last-Modified", "")
+
+
+# ==========================
+# Feed cache (one JSON file per URL)
+# ==========================
+_CACHE_TTL_SECS: float = FEED_CACHE_TTL_SECS
+
+
+def set_cache_ttl(secs: float) -> None:
+    """
+    Override FEED_CACHE_TTL_SECS for this process. Watch mode sets 0 so
+    every cycle sends a conditional GET instead of reusing a fresh copy.
+    """
+    global _CACHE_TTL_SECS
+    _CACHE_TTL_SECS = max(0.0, float(secs))
+
+
+def _feed_cache_path(url: str) -> str:
+    h = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(FEED_CACHE_DIR, f"{h}.json")
+
+
+def _item_to_json(it: FeedItem) -> Dict[str, Any]:
+    return {
+        "title": it.title,
+        "link": it.link,
+        "source": it.source,
+        "summary": it.summary,
+        "author": it.author,
+        "published_raw": it.published_raw,
+        "published_dt": it.published_dt.isoformat() if it.published_dt else None,
+    }
+
+
+def _item_from_json(d: Dict[str, Any]) -> FeedItem:
+    dt = d.get("published_dt")
+    return FeedItem(
+        title=d.get("title", ""),
+        link=d.get("link", ""),
+        source=d.get("source", ""),
+        summary=d.get("summary", ""),
+        author=d.get("author", ""),
+        published_raw=d.get("published_raw", ""),
+        published_dt=datetime.fromisoformat(dt) if dt else None,
+    )
+
+
+def _feed_cache_load(url: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_feed_cache_path(url), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        if entry.get("url") != url:
+            return None
+        return entry
+    except Exception:
+        return None
+
+
+def _feed_cache_save(url: str, entry: Dict[str, Any]) -> None:
+    path = _feed_cache_path(url)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(FEED_CACHE_DIR, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _cached_items(cached: Dict[str, Any]) -> List[FeedItem]:
+    items = [_item_from_json(d) for d in cached.get("items", [])]
+    profiling.count("feed.items", len(items))
+    return items
+
+
+def fetch_rss(url: str, use_cache: bool = FEED_CACHE_ENABLED) -> List[FeedItem]:
+    profiling.count("feed.requests")
+    if not url.startswith(("http://", "https://")):
+        # Local file or raw document: feedparser reads those itself
+        items = _items_from_entries(feedparser.parse(url).entries)
+        profiling.count("feed.items", len(items))
+        return items
+
+    if not use_cache:
+        with profiling.span("feed.download"):
+            status, body, _, _ = _download(url)
+        items = parse_rss(body) if status is not None else []
+        profiling.count("feed.items", len(items))
+        return items
+
+    cached = _feed_cache_load(url)
+    now = time.time()
+
+    if cached is not None and now - float(cached.get("fetched_at", 0)) < _CACHE_TTL_SECS:
+        profiling.count("feed.cache_fresh")
+        return _cached_items(cached)
+
+    with profiling.span("feed.download"):
+        status, body, etag, modified = _download(
+            url,
+            etag=(cached or {}).get("etag") or None,
+            modified=(cached or {}).get("modified") or None,
+        )
+
+    if cached is not None and (status == 304 or status is None):
+        # 304: nothing changed. No status: the request itself failed, so
+        # stale items beat an empty topic.
+        if status == 304:
+            profiling.count("feed.not_modified")
+            cached["fetched_at"] = now
+            _feed_cache_save(url, cached)
+        else:
+            profiling.count("feed.stale_fallback")
+        return _cached_items(cached)
+
+    items = parse_rss(body) if status is not None else []
+    profiling.count("feed.items", len(items))
+    if status is not None and status < 400:
+        _feed_cache_save(
+            url,
+            {
+                "url": url,
+                "fetched_at": now,
+                "etag": etag,
+                "modified": modified,
+                "items": [_item_to_json(it) for it in items],
+            },
+        )
+    return items
+
+
+def fetch_many(
+    urls: Sequence[str],
+    max_workers: int = FEED_FETCH_MAX_WORKERS,
+    max_per_host: int = FEED_FETCH_MAX_PER_HOST,
+) -> List[List[FeedItem]]:
+    """
+    Fetch several feeds concurrently.
+
+    Returns one list per input URL, in input order, so callers can merge
+    results exactly as a sequential loop would. A feed that fails yields [].
+    """
+    return list(iter_many(urls, max_workers, max_per_host))
+
+
+def iter_many(
+    urls: Sequence[str],
+    max_workers: int = FEED_FETCH_MAX_WORKERS,
+    max_per_host: int = FEED_FETCH_MAX_PER_HOST,
+) -> Iterator[List[FeedItem]]:
+    """
+    fetch_many as a generator: each feed's items are yielded in input order
+    as soon as they're ready, so a caller can fold them in and let the raw
+    list go before the next feed arrives. At most two feeds per worker are
+    in flight or waiting to be taken, so a slow consumer doesn't end up
+    holding every finished feed.
+    """
+    if not urls:
+        return
+
+    host_slots: Dict[str, threading.BoundedSemaphore] = {}
+    for url in urls:
+        host = urlsplit(url).netloc.lower()
+        if host not in host_slots:
+            host_slots[host] = threading.BoundedSemaphore(max(1, int(max_per_host)))
+
+    def one(url: str) -> List[FeedItem]:
+        with host_slots[urlsplit(url).netloc.lower()]:
+            try:
+                return fetch_rss(url)
+            except Exception:
+                return []
+
+    workers = max(1, min(int(max_workers), len(urls)))
+    if workers == 1:
+        for u in urls:
+            yield one(u)
+        return
+
+    todo = iter(urls)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feeds") as pool:
+        pending = deque(pool.submit(one, u) for u in islice(todo, 2 * workers))
+        while pending:
+            items = pending.popleft().result()
+            nxt = next(todo, None)
+            if nxt is not None:
+                pending.append(pool.submit(one, nxt))
+            yield items
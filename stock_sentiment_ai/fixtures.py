@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+# Synthetic Google News-style feeds for the benchmark suite and the tests.
+# Deliberately free of import-time side effects (unlike bench, which sets
+# env defaults before the package config loads), so tests can use it too.
+import hashlib
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Optional
+from xml.sax.saxutils import escape
+
+_PUBLISHERS = ["Reuters", "Bloomberg", "CNBC", "MarketWatch", "Yahoo Finance", "Financial Times", "WSJ", "Barron's"]
+_SUBJECTS = ["Gold", "Oil", "Nvidia", "Bitcoin", "Treasury yields", "The dollar", "European stocks", "Chinese markets"]
+_VERBS = ["jumps", "slides", "hits record", "steadies", "falls", "rallies", "edges higher", "tumbles"]
+_REASONS = [
+    "as Fed rate-cut bets grow",
+    "after inflation data",
+    "on OPEC supply worries",
+    "ahead of earnings",
+    "as ETF flows shift",
+    "amid tariff fears",
+    "on strong AI demand",
+    "as traders await jobs report",
+]
+
+
+def make_headline(r: random.Random, story: int) -> str:
+    """A plausible market headline, ending in its story number."""
+    return f"{r.choice(_SUBJECTS)} {r.choice(_VERBS)} {r.choice(_REASONS)} ({story})"
+
+
+def make_rss(n_items: int, offset: int = 0, now: Optional[datetime] = None) -> bytes:
+    """
+    RSS 2.0 shaped like Google News search results. Item ids start at
+    `offset`, so feeds with overlapping ranges share links (like overlapping
+    queries do). Every 10th item is a syndicated copy of the previous story
+    with a different link and publisher.
+    """
+    now = now or datetime.now(timezone.utc)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>',
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">',
+        "<channel><generator>NFE/5.0</generator><title>synthetic - Google News</title>",
+        "<link>https://news.google.com/search</link><language>en-US</language>",
+        "<description>Google News</description>",
+    ]
+    for i in range(offset, offset + n_items):
+        story = i - 1 if i % 10 == 9 else i
+        r = random.Random(story)
+        pub = _PUBLISHERS[i % len(_PUBLISHERS)]
+        headline = make_headline(r, story)
+        title = f"{headline} - {pub}"
+        link = f"https://news.google.com/rss/articles/{hashlib.sha1(str(i).encode()).hexdigest()}?oc=5"
+        published = format_datetime(now - timedelta(minutes=7 * i))
+        desc = f'<a href="{link}" target="_blank">{headline}</a>&nbsp;&nbsp;<font color="#6f6f6f">{pub}</font>'
+        parts.append(
+            "<item>"
+            f"<title>{escape(title)}</title>"
+            f"<link>{escape(link)}</link>"
+            f'<guid isPermaLink="false">{i}</guid>'
+            f"<pubDate>{published}</pubDate>"
+            f"<description>{escape(desc)}</description>"
+            f'<source url="https://www.example.com/{pub.lower().replace(" ", "")}">{escape(pub)}</source>'
+            "</item>"
+        )
+    parts.append("</channel></rss>")
+    return "".join(parts).encode("utf-8")
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Union
+from xml.etree.ElementTree import iterparse
+
+from .insiders_sec import CACHE_DIR, Form4Filing, get_sec_client
+
+# Form 4 XML ingestion.
+#
+# Each filing's primary XML document is downloaded once and stored by content
+# hash under .cache/form4_xml/. A small manifest maps accession -> hash, so an
+# accession we already have is never fetched again.
+
+SEC_ARCHIVE_DIR_URL = "https://www.sec.gov/Archives/edgar/data/{cik}/{acc_nodash}/"
+
+FORM4_XML_DIR = CACHE_DIR / "form4_xml"
+FORM4_MANIFEST = FORM4_XML_DIR / "manifest.json"
+
+
+@dataclass(frozen=True)
+class InsiderTransaction:
+    accession: str
+    issuer_ticker: str
+    owner: str
+    code: str  # SEC transaction code: P (buy), S (sell), A (grant), M (option exercise), ...
+    acquired_disposed: str  # "A" or "D"
+    shares: Optional[float]
+    price: Optional[float]
+    date: str
+    security: str
+    derivative: bool
+
+
+class Form4XmlCache:
+    """Content-addressed store of Form 4 XML, keyed by accession via a manifest."""
+
+    def __init__(self, root: Path = FORM4_XML_DIR) -> None:
+        self.root = Path(root)
+        self.manifest_path = self.root / FORM4_MANIFEST.name
+        self._lock = threading.Lock()
+        self._manifest: Optional[Dict[str, str]] = None
+
+    def _load(self) -> Dict[str, str]:
+        if self._manifest is None:
+            try:
+                self._manifest = json.loads(self.manifest_path.read_text())
+            except Exception:
+                self._manifest = {}
+        return self._manifest
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.xml"
+
+    def get(self, accession: str) -> Optional[Path]:
+        with self._lock:
+            digest = self._load().get(accession)
+        if not digest:
+            return None
+        path = self._blob_path(digest)
+        return path if path.exists() else None
+
+    def put(self, accession: str, content: bytes) -> Path:
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(content)
+            os.replace(tmp, path)
+
+        with self._lock:
+            manifest = self._load()
+            manifest[accession] = digest
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.manifest_path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(manifest, separators=(",", ":")))
+            os.replace(tmp, self.manifest_path)
+        return path
+
+    def accessions(self) -> List[str]:
+        with self._lock:
+            return list(self._load().keys())
+
+
+_XML_CACHE: Optional[Form4XmlCache] = None
+
+
+def get_form4_cache() -> Form4XmlCache:
+    global _XML_CACHE
+    if _XML_CACHE is None:
+        _XML_CACHE = Form4XmlCache()
+    return _XML_CACHE
+
+
+def _archive_dir_url(cik10: str, accession: str) -> str:
+    return SEC_ARCHIVE_DIR_URL.format(cik=int(cik10), acc_nodash=accession.replace("-", ""))
+
+
+def _primary_xml_name(cik10: str, accession: str) -> Optional[str]:
+    # The filing folder's index.json lists every document; the Form 4 itself is
+    # the lone .xml that isn't an index or XBRL-ish sidecar.
+    listing = get_sec_client().get(_archive_dir_url(cik10, accession) + "index.json").json()
+    items = (listing.get("directory", {}) or {}).get("item", []) or []
+    for it in items:
+        name = str(it.get("name", ""))
+        if name.lower().endswith(".xml") and "index" not in name.lower():
+            return name
+    return None
+
+
+def fetch_form4_xml(cik10: str, accession: str) -> Optional[Path]:
+    """Local path of a filing's Form 4 XML, downloading it only the first time."""
+    cache = get_form4_cache()
+    path = cache.get(accession)
+    if path is not None:
+        return path
+
+    name = _primary_xml_name(cik10, accession)
+    if not name:
+        return None
+    r = get_sec_client().get(_archive_dir_url(cik10, accession) + name)
+    return cache.put(accession, r.content)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _to_float(s: str) -> Optional[float]:
+    try:
+        return float(s.replace(",", "")) if s else None
+    except ValueError:
+        return None
+
+
+# Leaf fields inside a (non)derivativeTransaction we care about.
+# Most Form 4 values sit in a <value> child of the named element.
+_TX_FIELDS = {
+    "securityTitle": "security",
+    "transactionDate": "date",
+    "transactionCode": "code",
+    "transactionShares": "shares",
+    "transactionPricePerShare": "price",
+    "transactionAcquiredDisposedCode": "acquired_disposed",
+}
+
+
+def iter_form4_transactions(
+    source: Union[str, Path, IO[bytes]],
+    accession: str = "",
+) -> Iterator[InsiderTransaction]:
+    """
+    Stream transactions out of one Form 4 XML document.
+
+    Elements are cleared as soon as they're consumed, so memory stays flat no
+    matter how many transactions a filing holds.
+    """
+    ticker = ""
+    owners: List[str] = []
+    tx: Optional[Dict[str, str]] = None
+    stack: List[str] = []
+
+    for event, elem in iterparse(source, events=("start", "end")):
+        tag = _local(elem.tag)
+
+        if event == "start":
+            stack.append(tag)
+            if tag in ("nonDerivativeTransaction", "derivativeTransaction"):
+                tx = {}
+            continue
+
+        stack.pop()
+        text = (elem.text or "").strip()
+
+        if tag == "issuerTradingSymbol":
+            ticker = text.upper()
+        elif tag == "rptOwnerName" and text:
+            owners.append(text)
+        elif tx is not None and tag in ("nonDerivativeTransaction", "derivativeTransaction"):
+            yield InsiderTransaction(
+                accession=accession,
+                issuer_ticker=ticker,
+                owner="; ".join(owners),
+                code=tx.get("code", ""),
+                acquired_disposed=tx.get("acquired_disposed", ""),
+                shares=_to_float(tx.get("shares", "")),
+                price=_to_float(tx.get("price", "")),
+                date=tx.get("date", ""),
+                security=tx.get("security", ""),
+                derivative=tag == "derivativeTransaction",
+            )
+            tx = None
+            elem.clear()
+        elif tx is not None:
+            # <transactionCode> holds its text directly; the rest wrap a <value>
+            field = _TX_FIELDS.get(tag)
+            if field is None and tag == "value" and stack:
+                field = _TX_FIELDS.get(stack[-1])
+            if field and text and field not in tx:
+                tx[field] = text
+
+        if len(stack) <= 1:
+            # Top-level sections are done; drop them
+            elem.clear()
+
+
+def parse_form4_xml(source: Union[str, Path, IO[bytes]], accession: str = "") -> List[InsiderTransaction]:
+    return list(iter_form4_transactions(source, accession))
+
+
+def fetch_form4_transactions(cik10: str, filings: Iterable[Form4Filing]) -> List[InsiderTransaction]:
+    """Download (once) and parse the given filings. Unreadable filings are skipped."""
+    out: List[InsiderTransaction] = []
+    for f in filings:
+        try:
+            path = fetch_form4_xml(cik10, f.accession)
+            if path is not None:
+                out.extend(iter_form4_transactions(path, f.accession))
+        except Exception:
+            continue
+    return out
+
+
+def iter_cached_transactions() -> Iterator[InsiderTransaction]:
+    """Parse every Form 4 already in the local cache, with no network access."""
+    cache = get_form4_cache()
+    for accession in cache.accessions():
+        path = cache.get(accession)
+        if path is None:
+            continue
+        try:
+            yield from iter_form4_transactions(path, accession)
+        except Exception:
+            continue
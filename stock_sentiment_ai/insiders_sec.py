@@ -2,12 +2,18 @@ from __future__ import annotations
 
 import json
 import os
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .util import TokenBucketRateLimiter
 
 SEC_COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
 SEC_SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik10}.json"
@@ -15,6 +21,32 @@ SEC_SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik10}.json"
 CACHE_DIR = Path(".cache")
 CACHE_DIR.mkdir(exist_ok=True)
 TICKER_CACHE = CACHE_DIR / "sec_company_tickers.json"
+TICKER_INDEX_CACHE = CACHE_DIR / "sec_ticker_index.json"
+SUBMISSIONS_CACHE_DIR = CACHE_DIR / "submissions"
+
+# SEC fair-access policy: no more than 10 requests per second per client
+SEC_MAX_REQUESTS_PER_SEC = float(os.getenv("SEC_MAX_REQUESTS_PER_SEC", "10"))
+SEC_MAX_WORKERS = int(os.getenv("SEC_MAX_WORKERS", "4"))
+SEC_MAX_RETRIES = 4
+SEC_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Don't even send a conditional request for a CIK checked this recently
+SUBMISSIONS_MIN_POLL_SECS = int(os.getenv("SEC_SUBMISSIONS_MIN_POLL_SECS", "60"))
+# Form 4 filings remembered per CIK
+SUBMISSIONS_KEEP_FORM4 = 200
+
+# Answer Form 4 lookups only from local state (e.g. after edgar_bulk ingestion)
+SEC_OFFLINE = os.getenv("SEC_OFFLINE", "0") == "1"
+
+# company_tickers.json changes slowly; refresh our copy weekly by default
+TICKER_INDEX_TTL_SECS = int(os.getenv("SEC_TICKER_INDEX_TTL_SECS", str(7 * 24 * 3600)))
+# While SEC is unreachable and only a stale copy exists, try again this often
+TICKER_INDEX_RETRY_SECS = int(os.getenv("SEC_TICKER_INDEX_RETRY_SECS", "900"))
+
+# In-process ticker -> CIK index, built once and refreshed on TTL
+_TICKER_INDEX: Optional[Dict[str, int]] = None
+_TICKER_INDEX_BUILT_AT = 0.0
+_TICKER_INDEX_LOCK = threading.Lock()
 
 
 @dataclass(frozen=True)
@@ -38,32 +70,167 @@ def _sec_headers() -> Dict[str, str]:
     }
 
 
+class SecClient:
+    """
+    Shared SEC HTTP client: one pooled requests.Session, a thread-safe token
+    bucket held at SEC's published rate, and retry with exponential backoff
+    on 429/5xx and connection errors.
+    """
+
+    def __init__(
+        self,
+        rate_per_sec: float = SEC_MAX_REQUESTS_PER_SEC,
+        max_retries: int = SEC_MAX_RETRIES,
+        backoff_base_sec: float = 0.5,
+        pool_size: int = 10,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_base_sec = backoff_base_sec
+        self.limiter = TokenBucketRateLimiter(rate_per_sec)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(_sec_headers())
+
+    def _backoff(self, attempt: int, r: Optional[requests.Response]) -> float:
+        if r is not None:
+            retry_after = r.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff_base_sec * (2 ** attempt) + random.uniform(0, self.backoff_base_sec)
+
+    def get(self, url: str, timeout: int = 20, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                r = self.session.get(url, timeout=timeout, headers=headers)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt, None))
+                attempt += 1
+                continue
+
+            if r.status_code == 403:
+                raise RuntimeError(
+                    "SEC returned 403. Set a real SEC_USER_AGENT first, e.g.\n"
+                    'export SEC_USER_AGENT="DeclanNoonan (declannoonandd@gmail.com)"\n'
+                    "Then run again."
+                )
+            if r.status_code in SEC_RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(self._backoff(attempt, r))
+                attempt += 1
+                continue
+
+            r.raise_for_status()
+            return r
+
+
+_SEC_CLIENT: Optional[SecClient] = None
+_SEC_CLIENT_LOCK = threading.Lock()
+
+
+def get_sec_client() -> SecClient:
+    global _SEC_CLIENT
+    if _SEC_CLIENT is None:
+        with _SEC_CLIENT_LOCK:
+            if _SEC_CLIENT is None:
+                _SEC_CLIENT = SecClient()
+    return _SEC_CLIENT
+
+
 def _sec_get(url: str, timeout: int = 20) -> requests.Response:
-    r = requests.get(url, headers=_sec_headers(), timeout=timeout)
-    if r.status_code == 403:
-        raise RuntimeError(
-            "SEC returned 403. Set a real SEC_USER_AGENT first, e.g.\n"
-            'export SEC_USER_AGENT="DeclanNoonan (declannoonandd@gmail.com)"\n'
-            "Then run again."
-        )
-    r.raise_for_status()
-    return r
-
-
-def _load_company_tickers() -> Dict:
+    return get_sec_client().get(url, timeout=timeout)
+
+
+def _is_fresh(path: Path, ttl_secs: float) -> bool:
+    try:
+        return time.time() - path.stat().st_mtime < ttl_secs
+    except OSError:
+        return False
+
+
+def _load_company_tickers() -> Tuple[Dict, float]:
+    """Return (raw company_tickers data, time it was fetched from SEC)."""
     # Use cached file to avoid hammering SEC and getting blocked
-    if TICKER_CACHE.exists():
+    if _is_fresh(TICKER_CACHE, TICKER_INDEX_TTL_SECS):
         try:
-            return json.loads(TICKER_CACHE.read_text())
+            return json.loads(TICKER_CACHE.read_text()), TICKER_CACHE.stat().st_mtime
         except Exception:
             pass
 
-    data = _sec_get(SEC_COMPANY_TICKERS_URL).json()
+    try:
+        data = _sec_get(SEC_COMPANY_TICKERS_URL).json()
+    except Exception:
+        # Stale beats nothing if SEC is unreachable
+        if TICKER_CACHE.exists():
+            return json.loads(TICKER_CACHE.read_text()), TICKER_CACHE.stat().st_mtime
+        raise
+
+    fetched_at = time.time()
     try:
         TICKER_CACHE.write_text(json.dumps(data))
     except Exception:
         pass
-    return data
+    return data, fetched_at
+
+
+def _build_ticker_index(data: Dict) -> Dict[str, int]:
+    # company_tickers.json is an object keyed by integer-like strings.
+    # Keep the first row per ticker, matching the old linear scan.
+    index: Dict[str, int] = {}
+    for _, row in data.items():
+        t = str(row.get("ticker", "")).upper()
+        if t and t not in index:
+            index[t] = int(row.get("cik_str", 0))
+    return index
+
+
+def _load_ticker_index() -> Dict[str, int]:
+    """
+    Return the ticker -> CIK index, building it at most once per TTL.
+
+    The index is persisted as a flat {"TICKER": cik} JSON object, which loads
+    much faster than re-walking the raw SEC file. Both the persisted copy and
+    the in-memory one are stamped with the age of the raw data, so an index
+    rebuilt from a stale fallback is never mistaken for a fresh one.
+    """
+    global _TICKER_INDEX, _TICKER_INDEX_BUILT_AT
+
+    now = time.time()
+    if _TICKER_INDEX is not None and now - _TICKER_INDEX_BUILT_AT < TICKER_INDEX_TTL_SECS:
+        return _TICKER_INDEX
+
+    with _TICKER_INDEX_LOCK:
+        if _TICKER_INDEX is not None and now - _TICKER_INDEX_BUILT_AT < TICKER_INDEX_TTL_SECS:
+            return _TICKER_INDEX
+
+        if _is_fresh(TICKER_INDEX_CACHE, TICKER_INDEX_TTL_SECS):
+            try:
+                _TICKER_INDEX = json.loads(TICKER_INDEX_CACHE.read_text())
+                _TICKER_INDEX_BUILT_AT = TICKER_INDEX_CACHE.stat().st_mtime
+                return _TICKER_INDEX
+            except Exception:
+                pass
+
+        data, fetched_at = _load_company_tickers()
+        index = _build_ticker_index(data)
+        try:
+            TICKER_INDEX_CACHE.write_text(json.dumps(index, separators=(",", ":")))
+            os.utime(TICKER_INDEX_CACHE, (fetched_at, fetched_at))
+        except Exception:
+            pass
+
+        _TICKER_INDEX = index
+        if now - fetched_at < TICKER_INDEX_TTL_SECS:
+            _TICKER_INDEX_BUILT_AT = fetched_at
+        else:
+            # Stale fallback: serve it, but retry SEC after a short back-off
+            _TICKER_INDEX_BUILT_AT = now - TICKER_INDEX_TTL_SECS + TICKER_INDEX_RETRY_SECS
+        return index
 
 
 def lookup_cik_for_ticker(ticker: str) -> Optional[str]:
@@ -71,43 +238,143 @@ def lookup_cik_for_ticker(ticker: str) -> Optional[str]:
     if not t:
         return None
 
-    data = _load_company_tickers()
-    # company_tickers.json is an object keyed by integer-like strings
-    for _, row in data.items():
-        if str(row.get("ticker", "")).upper() == t:
-            cik = int(row.get("cik_str", 0))
-            return f"{cik:010d}"
-    return None
+    cik = _load_ticker_index().get(t)
+    if cik is None:
+        return None
+    return f"{cik:010d}"
 
 
-def fetch_recent_form4_filings(cik10: str, limit: int = 10) -> List[Form4Filing]:
-    # Be polite
-    time.sleep(0.15)
+def lookup_ciks(tickers: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Bulk version of lookup_cik_for_ticker. Keys are the upper-cased tickers.
+    """
+    index = _load_ticker_index()
+    out: Dict[str, Optional[str]] = {}
+    for ticker in tickers:
+        t = (ticker or "").strip().upper()
+        if not t:
+            continue
+        cik = index.get(t)
+        out[t] = f"{cik:010d}" if cik is not None else None
+    return out
 
-    js = _sec_get(SEC_SUBMISSIONS_URL.format(cik10=cik10)).json()
-    recent = (js.get("filings", {}) or {}).get("recent", {}) or {}
 
+def _form4_from_recent(cik10: str, recent: Dict, stop_at: str = "") -> List[Form4Filing]:
+    # `recent` arrays are newest first, so we can stop at the last accession we saw
     forms = recent.get("form", []) or []
     dates = recent.get("filingDate", []) or []
     accessions = recent.get("accessionNumber", []) or []
+    cik_nolead = str(int(cik10))  # remove leading zeros for archive path
 
     out: List[Form4Filing] = []
     for form, d, acc in zip(forms, dates, accessions):
+        if stop_at and acc == stop_at:
+            break
         if form != "4":
             continue
 
         accession_nodash = acc.replace("-", "")
-        cik_nolead = str(int(cik10))  # remove leading zeros for archive path
-
         url = f"https://www.sec.gov/Archives/edgar/data/{cik_nolead}/{accession_nodash}/{acc}-index.html"
         out.append(Form4Filing(filing_date=d, url=url, accession=acc))
 
-        if len(out) >= limit:
-            break
-
     return out
 
 
+def _submissions_cache_path(cik10: str) -> Path:
+    return SUBMISSIONS_CACHE_DIR / f"CIK{cik10}.json"
+
+
+def _load_submissions_state(cik10: str) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(_submissions_cache_path(cik10).read_text())
+    except Exception:
+        return None
+
+
+def _save_submissions_state(cik10: str, state: Dict[str, Any]) -> None:
+    try:
+        SUBMISSIONS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _submissions_cache_path(cik10)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+
+def _sync_form4_filings(cik10: str) -> Tuple[List[Form4Filing], List[Form4Filing]]:
+    """
+    Bring the local Form 4 list for one CIK up to date.
+
+    Returns (all_known_newest_first, new_since_last_sync). The submissions
+    document is only re-downloaded when SEC says it changed (ETag /
+    Last-Modified), and only entries newer than the last seen accession are
+    walked. On the very first sync every Form 4 counts as new.
+    """
+    state = _load_submissions_state(cik10)
+    now = time.time()
+
+    known: List[Form4Filing] = []
+    if state is not None:
+        known = [Form4Filing(**f) for f in state.get("filings", [])]
+        if now - float(state.get("checked_at", 0)) < SUBMISSIONS_MIN_POLL_SECS:
+            return known, []
+    if SEC_OFFLINE:
+        return known, []
+
+    headers: Dict[str, str] = {}
+    if state is not None and state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state is not None and state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+
+    r = get_sec_client().get(SEC_SUBMISSIONS_URL.format(cik10=cik10), headers=headers or None)
+
+    if r.status_code == 304 and state is not None:
+        state["checked_at"] = now
+        _save_submissions_state(cik10, state)
+        return known, []
+
+    js = r.json()
+    recent = (js.get("filings", {}) or {}).get("recent", {}) or {}
+    last_seen = (state or {}).get("last_accession", "")
+
+    new = _form4_from_recent(cik10, recent, stop_at=last_seen)
+    seen = {f.accession for f in new}
+    # Bulk-ingested history (see edgar_bulk) may be longer than the cap; keep its depth
+    keep = max(SUBMISSIONS_KEEP_FORM4, len(known))
+    merged = (new + [f for f in known if f.accession not in seen])[:keep]
+
+    _save_submissions_state(
+        cik10,
+        {
+            "checked_at": now,
+            "etag": r.headers.get("ETag", ""),
+            "last_modified": r.headers.get("Last-Modified", ""),
+            "last_accession": merged[0].accession if merged else last_seen,
+            "filings": [
+                {"filing_date": f.filing_date, "url": f.url, "accession": f.accession} for f in merged
+            ],
+        },
+    )
+    return merged, new
+
+
+def fetch_recent_form4_filings(cik10: str, limit: int = 10) -> List[Form4Filing]:
+    # Politeness is handled by the shared client's rate limiter
+    known, _ = _sync_form4_filings(cik10)
+    return known[:limit]
+
+
+def fetch_new_form4_filings(cik10: str) -> List[Form4Filing]:
+    """
+    Form 4 filings that appeared since the previous poll of this CIK, newest
+    first. Returns [] without downloading anything when nothing changed.
+    """
+    _, new = _sync_form4_filings(cik10)
+    return new
+
+
 def fetch_insider_transactions_for_ticker(ticker: str, limit: int = 10) -> List[Dict[str, str]]:
     cik10 = lookup_cik_for_ticker(ticker)
     if not cik10:
@@ -117,3 +384,31 @@ def fetch_insider_transactions_for_ticker(ticker: str, limit: int = 10) -> List[
     return [{"filing_date": f.filing_date, "url": f.url, "accession": f.accession} for f in filings]
 
 
+def fetch_insider_transactions_for_tickers(
+    tickers: Iterable[str],
+    limit: int = 10,
+    max_workers: int = SEC_MAX_WORKERS,
+) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Fetch recent Form 4 filings for many tickers in parallel.
+
+    All workers share one SecClient, so the combined request rate stays under
+    SEC's limit however many workers run. Keys are upper-cased tickers in
+    input order; a ticker with no CIK or a failed fetch maps to [].
+    """
+    ciks = lookup_ciks(tickers)
+
+    def one(cik10: Optional[str]) -> List[Dict[str, str]]:
+        if not cik10:
+            return []
+        try:
+            filings = fetch_recent_form4_filings(cik10, limit=limit)
+        except Exception:
+            return []
+        return [{"filing_date": f.filing_date, "url": f.url, "accession": f.accession} for f in filings]
+
+    keys = list(ciks.keys())
+    workers = max(1, min(int(max_workers), len(keys)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sec") as pool:
+        results = list(pool.map(one, [ciks[k] for k in keys]))
+    return dict(zip(keys, results))
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from .feeds import FeedItem
+
+# Wire stories get syndicated with slightly different titles and different
+# links ("Gold hits record high - Reuters" vs "Gold hits a record high as ...").
+# We compare normalized title token sets by Jaccard similarity, using MinHash
+# signatures and LSH banding so each lookup only touches likely matches.
+
+# Google News titles end with " - Publisher"
+_PUBLISHER_SUFFIX = re.compile(r"\s+[-|]\s+[^-|]{1,60}$")
+_TOKEN = re.compile(r"[a-z0-9$%]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the to was were will with".split()
+)
+
+# Titles this short don't carry enough signal for a fuzzy match
+MIN_TOKENS_FOR_FUZZY = 4
+
+# 32 hash functions in 8 bands of 4 rows: pairs at Jaccard 0.8 become
+# candidates ~98% of the time, pairs at 0.3 only ~6% of the time.
+MINHASH_PERMUTATIONS = 32
+LSH_BANDS = 8
+_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 64) - 1
+
+
+def _perm_params() -> List[Tuple[int, int]]:
+    # Fixed, derived parameters so signatures are stable across runs
+    out: List[Tuple[int, int]] = []
+    for i in range(MINHASH_PERMUTATIONS):
+        d = hashlib.blake2b(f"minhash-{i}".encode("ascii"), digest_size=16).digest()
+        a = int.from_bytes(d[:8], "big") % (_PRIME - 1) + 1
+        b = int.from_bytes(d[8:], "big") % _PRIME
+        out.append((a, b))
+    return out
+
+
+_PERMS = _perm_params()
+
+
+def normalize_title(title: str) -> List[str]:
+    t = _PUBLISHER_SUFFIX.sub("", (title or "").strip()).lower()
+    return [w for w in _TOKEN.findall(t) if w not in _STOPWORDS]
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(tokens: FrozenSet[str]) -> Tuple[int, ...]:
+    hashes = [_token_hash(t) for t in tokens]
+    if not hashes:
+        return tuple([_MAX_HASH] * MINHASH_PERMUTATIONS)
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashIndex:
+    """
+    LSH index over MinHash signatures.
+
+    Each band of the signature is a dict key, so a lookup is a handful of
+    dict probes plus an exact Jaccard check on the few candidates found.
+    """
+
+    def __init__(self, threshold: float = 0.7) -> None:
+        self.threshold = float(threshold)
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(LSH_BANDS)]
+        self._tokens: List[FrozenSet[str]] = []
+
+    @staticmethod
+    def _bands(sig: Tuple[int, ...]):
+        for i in range(LSH_BANDS):
+            yield i, sig[i * _ROWS:(i + 1) * _ROWS]
+
+    def find(self, tokens: FrozenSet[str], sig: Tuple[int, ...]) -> Optional[int]:
+        """Return the id of an indexed token set at or above the threshold, if any."""
+        checked = set()
+        for i, band in self._bands(sig):
+            for item_id in self._buckets[i].get(band, ()):
+                if item_id in checked:
+                    continue
+                checked.add(item_id)
+                if jaccard(tokens, self._tokens[item_id]) >= self.threshold:
+                    return item_id
+        return None
+
+    def add(self, tokens: FrozenSet[str], sig: Tuple[int, ...]) -> int:
+        item_id = len(self._tokens)
+        self._tokens.append(tokens)
+        for i, band in self._bands(sig):
+            self._buckets[i].setdefault(band, []).append(item_id)
+        return item_id
+
+
+def group_near_duplicates(
+    items: Sequence[FeedItem],
+    threshold: float = 0.7,
+) -> List[List[FeedItem]]:
+    """
+    Group near-duplicate headlines into clusters, in first-seen order. Each
+    cluster lists its members in feed order, so the first one is the
+    representative (feed order is Google's relevance order).
+    """
+    index = MinHashIndex(threshold)
+    exact: Dict[FrozenSet[str], int] = {}
+    fuzzy_to_cluster: Dict[int, int] = {}
+    groups: List[List[FeedItem]] = []
+
+    for it in items:
+        tokens = frozenset(normalize_title(it.title))
+
+        cid = exact.get(tokens) if tokens else None
+        sig: Optional[Tuple[int, ...]] = None
+        if cid is None and len(tokens) >= MIN_TOKENS_FOR_FUZZY:
+            sig = minhash(tokens)
+            match = index.find(tokens, sig)
+            if match is not None:
+                cid = fuzzy_to_cluster[match]
+
+        if cid is not None:
+            groups[cid].append(it)
+            continue
+
+        cid = len(groups)
+        groups.append([it])
+        if tokens:
+            exact[tokens] = cid
+        if sig is not None:
+            fuzzy_to_cluster[index.add(tokens, sig)] = cid
+
+    return groups
+
+
+def cluster_near_duplicates(
+    items: Sequence[FeedItem],
+    threshold: float = 0.7,
+) -> List[Tuple[FeedItem, int]]:
+    """
+    Group near-duplicate headlines.
+
+    Returns (representative, cluster_size) pairs in first-seen order. The
+    representative is the first item of each cluster, so feed order (which
+    is Google's relevance order) still decides what gets shown.
+    """
+    return [(g[0], len(g)) for g in group_near_duplicates(items, threshold)]
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import os
+import time
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
 
 import pandas as pd
 
-from .config import QUIVER_API_KEY
+from .config import QUIVER_API_KEY, TRADE_WATCHLIST
 
 
 @dataclass(frozen=True)
@@ -17,65 +21,275 @@ class PolTrade:
     amount: str
 
 
-def fetch_recent_congress_trades(
-    tickers: Optional[List[str]] = None,
-    limit: int = 50,
-) -> List[PolTrade]:
+# Canonical columns of the local store
+TRADE_COLUMNS = ["ticker", "politician", "transaction", "date", "amount"]
+# Plus a per-source-row key used for deduplication, so that two genuinely
+# identical trades (same member, ticker, day and range) are both kept
+STORE_COLUMNS = TRADE_COLUMNS + ["row_key"]
+
+CONGRESS_STORE_PATH = Path(os.getenv("CONGRESS_STORE_PATH", os.path.join(".cache", "congress_trades.parquet")))
+# Re-pull from the source at most this often; queries in between are local
+CONGRESS_REFRESH_SECS = int(os.getenv("CONGRESS_REFRESH_SECS", "3600"))
+
+
+# ==========================
+# Sources
+# ==========================
+class TradeSource(ABC):
+    """Anything that can hand back a raw congress-trades DataFrame."""
+
+    @abstractmethod
+    def fetch(self, tickers: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        ...
+
+
+class QuiverSource(TradeSource):
     """
     Uses QuiverQuant python API. Needs QUIVER_API_KEY env var.
-    If no key, returns empty list.
-
     Quiver method is `congress_trading()` per their package README.
     """
-    if not QUIVER_API_KEY:
-        return []
 
-    try:
-        import quiverquant
-    except Exception:
-        return []
+    def __init__(self, api_key: str = QUIVER_API_KEY) -> None:
+        self.api_key = api_key
+
+    def fetch(self, tickers: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        if not self.api_key:
+            return None
+
+        try:
+            import quiverquant
+        except Exception:
+            return None
+
+        q = quiverquant.quiver(self.api_key)
+
+        try:
+            if tickers and len(tickers) == 1:
+                return q.congress_trading(tickers[0])
+            return q.congress_trading()
+        except Exception:
+            return None
+
 
-    q = quiverquant.quiver(QUIVER_API_KEY)
+class DataFrameSource(TradeSource):
+    """Local stand-in: serves a fixed DataFrame (handy for tests and replays)."""
 
-    try:
-        if tickers and len(tickers) == 1:
-            df = q.congress_trading(tickers[0])
-        else:
-            df = q.congress_trading()
-    except Exception:
-        return []
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
 
+    def fetch(self, tickers: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        return self.df
+
+
+def normalize_trades(df: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """Map Quiver's (occasionally renamed) columns onto TRADE_COLUMNS."""
     if df is None or len(df) == 0:
-        return []
+        return _empty_trades()
 
     # Normalize columns defensively (Quiver sometimes changes naming)
     cols = {c.lower(): c for c in df.columns}
+
     def pick(*names: str) -> Optional[str]:
         for n in names:
             if n.lower() in cols:
                 return cols[n.lower()]
         return None
 
-    c_ticker = pick("ticker", "symbol")
-    c_pol = pick("representative", "politician", "name")
-    c_tx = pick("transaction", "type")
-    c_date = pick("transactiondate", "date")
-    c_amt = pick("amount", "range")
-
-    out: List[PolTrade] = []
-    for _, row in df.head(limit).iterrows():
-        ticker = str(row.get(c_ticker, "")).upper() if c_ticker else ""
-        if tickers and ticker and ticker not in set([t.upper() for t in tickers]):
-            continue
-
-        out.append(
-            PolTrade(
-                ticker=ticker or "UNKNOWN",
-                politician=str(row.get(c_pol, "Unknown")) if c_pol else "Unknown",
-                transaction=str(row.get(c_tx, "Unknown")) if c_tx else "Unknown",
-                date=str(row.get(c_date, "")) if c_date else "",
-                amount=str(row.get(c_amt, "")) if c_amt else "",
-            )
-        )
-
-    return out
+    def col(default: str, *names: str) -> pd.Series:
+        c = pick(*names)
+        if c is None:
+            return pd.Series(default, index=df.index, dtype="object")
+        return df[c].astype("string").fillna(default).astype("object")
+
+    out = pd.DataFrame(
+        {
+            "ticker": col("", "ticker", "symbol").str.upper().str.strip(),
+            "politician": col("Unknown", "representative", "politician", "name"),
+            "transaction": col("Unknown", "transaction", "type"),
+            "date": pd.to_datetime(col("", "transactiondate", "date"), errors="coerce"),
+            "amount": col("", "amount", "range"),
+        }
+    )
+    out.loc[out["ticker"] == "", "ticker"] = "UNKNOWN"
+    out["row_key"] = _row_keys(df)
+    return out.reset_index(drop=True)
+
+
+def _row_keys(df: pd.DataFrame) -> pd.Series:
+    """
+    Key each source row by a hash of all its raw fields plus its occurrence
+    number among identical rows, so re-fetching the same rows yields the same
+    keys while repeated identical rows in one response stay distinct.
+    """
+    h = pd.util.hash_pandas_object(df.astype(str), index=False)
+    n = h.groupby(h).cumcount()
+    return pd.Series([f"{a:016x}-{b}" for a, b in zip(h, n)], index=df.index, dtype="object")
+
+
+def _empty_trades() -> pd.DataFrame:
+    df = pd.DataFrame({c: pd.Series(dtype="object") for c in STORE_COLUMNS})
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+# ==========================
+# Columnar store
+# ==========================
+class CongressTradeStore:
+    """
+    Local Parquet file of normalized trades.
+
+    New trades are merged in incrementally (rows already stored, by source
+    row key, are dropped), and queries are plain vectorized pandas filters
+    over the columns. If the file can't be written (no Parquet engine, disk
+    or permission errors) the store keeps working from memory.
+    """
+
+    def __init__(self, path: Path = CONGRESS_STORE_PATH) -> None:
+        self.path = Path(path)
+        self._df: Optional[pd.DataFrame] = None
+        self._refreshed_at = 0.0
+
+    def load(self) -> pd.DataFrame:
+        if self._df is None:
+            try:
+                df = pd.read_parquet(self.path)
+                if "row_key" not in df.columns:
+                    # Stores written before row keys: key on the normalized fields
+                    df["row_key"] = _row_keys(df[TRADE_COLUMNS])
+                self._df = df
+            except Exception:
+                self._df = _empty_trades()
+        return self._df
+
+    def age_secs(self) -> float:
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            mtime = 0.0
+        last = max(mtime, self._refreshed_at)
+        return time.time() - last if last else float("inf")
+
+    def _save(self, df: pd.DataFrame) -> bool:
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, self.path)
+            return True
+        except Exception:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return False
+
+    def append(self, trades: pd.DataFrame) -> int:
+        """Merge normalized trades into the store. Returns how many were new."""
+        if trades is None or len(trades) == 0:
+            return 0
+
+        current = self.load()
+        before = len(current)
+        merged = pd.concat([current, trades[STORE_COLUMNS]], ignore_index=True)
+        merged = merged.drop_duplicates(subset="row_key", keep="first")
+        merged = merged.sort_values("date", ascending=False, na_position="last", kind="stable")
+        merged = merged.reset_index(drop=True)
+
+        # On a failed write the merged frame still serves this process
+        self._save(merged)
+        self._df = merged
+        return len(merged) - before
+
+    def refresh(self, source: TradeSource, tickers: Optional[List[str]] = None, force: bool = False) -> int:
+        if not force and self.age_secs() < CONGRESS_REFRESH_SECS:
+            return 0
+
+        raw = source.fetch(tickers)
+        if raw is None:
+            return 0
+
+        added = self.append(normalize_trades(raw))
+        self._refreshed_at = time.time()
+        try:
+            # Mark fresh even when nothing new came back
+            os.utime(self.path)
+        except OSError:
+            pass
+        return added
+
+    def query(
+        self,
+        tickers: Optional[Iterable[str]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        topic: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Filter trades by ticker list, date range and/or TRADE_WATCHLIST topic.
+        Given both `tickers` and `topic`, only tickers in both are kept.
+        Newest first; `limit` applies after filtering.
+        """
+        df = self.load()
+        mask = pd.Series(True, index=df.index)
+
+        wanted: Optional[Set[str]] = {t.upper() for t in tickers} if tickers else None
+        if topic:
+            in_topic = {t.upper() for t in TRADE_WATCHLIST.get(topic, [])}
+            wanted = in_topic if wanted is None else wanted & in_topic
+        if wanted is not None:
+            if not wanted:
+                return df.iloc[0:0]
+            mask &= df["ticker"].isin(wanted)
+        if since:
+            mask &= df["date"] >= pd.Timestamp(since)
+        if until:
+            mask &= df["date"] <= pd.Timestamp(until)
+
+        out = df[mask]
+        if limit is not None:
+            out = out.head(limit)
+        return out
+
+
+def trades_by_topic(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Group trades into TRADE_WATCHLIST topics (a ticker can sit in several)."""
+    return {topic: df[df["ticker"].isin({t.upper() for t in tks})] for topic, tks in TRADE_WATCHLIST.items()}
+
+
+def _to_poltrades(df: pd.DataFrame) -> List[PolTrade]:
+    dates = df["date"].dt.strftime("%Y-%m-%d").fillna("")
+    return [
+        PolTrade(ticker=t, politician=p, transaction=x, date=d, amount=a)
+        for t, p, x, d, a in zip(df["ticker"], df["politician"], df["transaction"], dates, df["amount"])
+    ]
+
+
+_STORE: Optional[CongressTradeStore] = None
+
+
+def get_store() -> CongressTradeStore:
+    global _STORE
+    if _STORE is None:
+        _STORE = CongressTradeStore()
+    return _STORE
+
+
+def fetch_recent_congress_trades(
+    tickers: Optional[List[str]] = None,
+    limit: int = 50,
+    source: Optional[TradeSource] = None,
+    store: Optional[CongressTradeStore] = None,
+) -> List[PolTrade]:
+    """
+    Recent congress trades, optionally filtered to `tickers`.
+
+    The store is refreshed from `source` (Quiver by default) at most every
+    CONGRESS_REFRESH_SECS; otherwise this is a local query. With no Quiver
+    key and nothing stored, returns an empty list.
+    """
+    store = store or get_store()
+    # Always pull the full recent list so one refresh serves every ticker query
+    store.refresh(source or QuiverSource())
+    return _to_poltrades(store.query(tickers=tickers, limit=limit))
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Dict, Optional
+
+# Lightweight per-stage timing spans and counters.
+#
+#   with profiling.span("scan.fetch"):
+#       ...
+#   profiling.count("scan.items_fetched", len(items))
+#
+# Off by default: span() then hands back one shared no-op object and count()
+# returns immediately, so instrumented code pays a function call and a flag
+# check per stage (never per item). Spans opened on worker threads add up
+# per-thread time, so a stage's total can exceed wall clock.
+
+_ENABLED = False
+_LOCK = threading.Lock()
+_SPANS: Dict[str, list] = {}  # name -> [calls, total_s, max_s]
+_COUNTERS: Dict[str, int] = {}
+
+
+def enable(on: bool = True) -> None:
+    global _ENABLED
+    _ENABLED = bool(on)
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def reset() -> None:
+    with _LOCK:
+        _SPANS.clear()
+        _COUNTERS.clear()
+
+
+class _Span:
+    __slots__ = ("name", "_t0")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._t0 = 0.0
+
+    def __enter__(self) -> "_Span":
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        dt = time.perf_counter() - self._t0
+        with _LOCK:
+            rec = _SPANS.get(self.name)
+            if rec is None:
+                _SPANS[self.name] = [1, dt, dt]
+            else:
+                rec[0] += 1
+                rec[1] += dt
+                if dt > rec[2]:
+                    rec[2] = dt
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str):
+    return _Span(name) if _ENABLED else _NULL_SPAN
+
+
+def count(name: str, n: int = 1) -> None:
+    if not _ENABLED:
+        return
+    with _LOCK:
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + int(n)
+
+
+def snapshot() -> Dict[str, Dict[str, object]]:
+    with _LOCK:
+        spans = {
+            name: {
+                "calls": calls,
+                "total_ms": round(total * 1000.0, 3),
+                "mean_ms": round(total * 1000.0 / calls, 3),
+                "max_ms": round(mx * 1000.0, 3),
+            }
+            for name, (calls, total, mx) in _SPANS.items()
+        }
+        counters = dict(_COUNTERS)
+    return {"spans": spans, "counters": counters}
+
+
+def format_table(snap: Optional[Dict[str, Dict[str, object]]] = None) -> str:
+    snap = snap or snapshot()
+    lines = ["PROFILE", f"{'span':40} {'calls':>7} {'total ms':>11} {'mean ms':>10} {'max ms':>10}"]
+    for name in sorted(snap["spans"]):
+        s = snap["spans"][name]
+        lines.append(
+            f"{name:40} {s['calls']:>7} {s['total_ms']:>11.1f} {s['mean_ms']:>10.2f} {s['max_ms']:>10.2f}"
+        )
+    if snap["counters"]:
+        lines.append("")
+        lines.append(f"{'counter':40} {'value':>7}")
+        for name in sorted(snap["counters"]):
+            lines.append(f"{name:40} {snap['counters'][name]:>7}")
+    return "\n".join(lines)
+
+
+def write_json(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, indent=2)
+        f.write("\n")
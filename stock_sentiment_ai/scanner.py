@@ -1,16 +1,33 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Container, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Sequence, Set, Tuple
 
-from .feeds import FeedItem, fetch_rss, google_news_rss_url
-from .sentiment import predict_sentiment
+from . import profiling
+from .cascade import cascade_applies, prerank, select_candidates
+from .config import (
+    CASCADE_BUDGET_PER_TOPIC,
+    CASCADE_ENABLED,
+    NEARDUP_ENABLED,
+    NEARDUP_THRESHOLD,
+    SCAN_PREPARE_AHEAD,
+    SentimentResult,
+)
+from .feeds import FeedItem, google_news_rss_url, iter_many
+from .neardup import group_near_duplicates
+from .sentiment import predict_sentiment_batch
 from .topics import TOPICS
-from .util import clean_text
+from .util import clean_text, dedupe_keep_order, iter_ahead
 
+if TYPE_CHECKING:
+    from .dailylog import DailyLogWriter
+    from .store import HeadlineStore
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ScoredItem:
     label: str
     confidence: float
@@ -21,15 +38,16 @@ class ScoredItem:
     published_raw: str
     published_dt: Optional[datetime]
     used: str  # "TITLEONLY" or "TITLE+SNIPPET"
+    cluster_size: int = 1  # how many near-duplicate headlines this one stands for
 
+    def __post_init__(self) -> None:
+        # Shared strings (publisher, author, label) are interned; long-lived
+        # history and watch-mode maps hold many items per publisher.
+        for name in ("label", "source", "author", "used"):
+            object.__setattr__(self, name, sys.intern(getattr(self, name)))
 
-def scan_topic(
-    topic_key: str,
-    top_k: int = 6,
-    use_snippet: bool = True,
-    since_dt: Optional[datetime] = None,
-    until_dt: Optional[datetime] = None,
-) -> Tuple[List[ScoredItem], Dict[str, int]]:
+
+def topic_feed_urls(topic_key: str) -> List[str]:
     topic = TOPICS[topic_key]
     queries = topic.get("queries", [])
     extra_rss = topic.get("extra_rss", [])
@@ -38,16 +56,13 @@ def scan_topic(
     for q in queries:
         feed_urls.append(google_news_rss_url(q))
     feed_urls.extend(extra_rss)
+    return feed_urls
 
-    items: List[FeedItem] = []
-    for url in feed_urls:
-        try:
-            items.extend(fetch_rss(url))
-        except Exception:
-            continue
 
-    # Deduplicate hard (Google News overlaps a lot)
-    seen = set()
+def _dedupe_by_link(items: Iterable[FeedItem], seen: Optional[set] = None) -> List[FeedItem]:
+    # Deduplicate hard (Google News overlaps a lot). Pass `seen` to dedupe
+    # across several calls.
+    seen = set() if seen is None else seen
     deduped: List[FeedItem] = []
     for it in items:
         key = (it.link or "").strip()
@@ -55,34 +70,125 @@ def scan_topic(
             continue
         seen.add(key)
         deduped.append(it)
+    return deduped
 
-    # Filter by time window BEFORE sentiment scoring
-    filtered: List[FeedItem] = []
-    for it in deduped:
-        dt = it.published_dt
-        if since_dt or until_dt:
-            # If we're window-filtering and we don't have a parsed datetime,
-            # skip it to keep the window “real”.
+
+REJECT_REASONS = ("blocked_source", "undated", "out_of_window", "seen")
+
+
+@dataclass
+class ItemFilter:
+    """
+    Predicates applied to fetched items before scoring, so rejected items
+    never cost inference. apply() runs the per-item checks (source, date)
+    before clustering, cheap ones first; apply_seen() drops whole clusters
+    after it. `rejected` counts rejections per reason over every call.
+    """
+
+    since_dt: Optional[datetime] = None
+    until_dt: Optional[datetime] = None
+    keep_undated: bool = False  # with a window, keep items that have no parsed date
+    seen_links: Optional[Container[str]] = None  # e.g. a HeadlineStore or watch-mode map
+    blocked_sources: Iterable[str] = ()  # publisher names, any case
+    rejected: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(REJECT_REASONS, 0))
+
+    def __post_init__(self) -> None:
+        self.blocked_sources = frozenset(s.strip().lower() for s in self.blocked_sources if s.strip())
+
+    def reject_reason(self, it: FeedItem) -> Optional[str]:
+        if self.blocked_sources and it.source.strip().lower() in self.blocked_sources:
+            return "blocked_source"
+        if self.since_dt or self.until_dt:
+            dt = it.published_dt
             if dt is None:
-                continue
-            if since_dt and dt < since_dt:
-                continue
-            if until_dt and dt > until_dt:
-                continue
-        filtered.append(it)
+                if not self.keep_undated:
+                    return "undated"
+            else:
+                if dt.tzinfo is None:
+                    # e.g. from a feed cache written before dates were normalized
+                    dt = dt.replace(tzinfo=timezone.utc)
+                if (self.since_dt and dt < self.since_dt) or (self.until_dt and dt > self.until_dt):
+                    return "out_of_window"
+        return None
 
-    scored: List[ScoredItem] = []
-    counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
+    def apply(self, items: Iterable[FeedItem]) -> List[FeedItem]:
+        kept: List[FeedItem] = []
+        rejected: Dict[str, int] = {}
+        for it in items:
+            reason = self.reject_reason(it)
+            if reason is None:
+                kept.append(it)
+            else:
+                rejected[reason] = rejected.get(reason, 0) + 1
+        for reason, n in rejected.items():
+            self._reject(reason, n)
+        return kept
+
+    def apply_seen(self, groups: Sequence[List[FeedItem]]) -> List[List[FeedItem]]:
+        """
+        Drop every near-duplicate cluster with a member in `seen_links`.
+        Only representatives get stored or remembered, so checking items one
+        by one would bring a story back through its syndicated copies.
+        """
+        if self.seen_links is None:
+            return list(groups)
+        kept: List[List[FeedItem]] = []
+        n_seen = 0
+        for g in groups:
+            if any(it.link.strip() in self.seen_links for it in g):
+                n_seen += len(g)
+            else:
+                kept.append(g)
+        if n_seen:
+            self._reject("seen", n_seen)
+        return kept
+
+    def _reject(self, reason: str, n: int) -> None:
+        self.rejected[reason] = self.rejected.get(reason, 0) + n
+        profiling.count(f"scan.rejected.{reason}", n)
+
+
+def _cluster(
+    items: Sequence[FeedItem],
+    near_dedupe: bool,
+    flt: Optional[ItemFilter] = None,
+) -> Tuple[List[FeedItem], List[int]]:
+    # (representatives, cluster sizes); with `flt`, clusters holding an
+    # already-seen link are dropped whole
+    groups = group_near_duplicates(items, NEARDUP_THRESHOLD) if near_dedupe else [[it] for it in items]
+    if flt is not None:
+        groups = flt.apply_seen(groups)
+    return [g[0] for g in groups], [len(g) for g in groups]
 
-    for it in filtered:
-        used = "TITLEONLY"
-        text = it.title
 
-        if use_snippet and it.summary:
-            used = "TITLE+SNIPPET"
-            text = f"{it.title}. {it.summary}"
+def _text_for(it: FeedItem, use_snippet: bool) -> Tuple[str, str]:
+    if use_snippet and it.summary:
+        return f"{it.title}. {it.summary}", "TITLE+SNIPPET"
+    return it.title, "TITLEONLY"
 
-        s = predict_sentiment(text)
+
+def _score_items(
+    items: Sequence[FeedItem],
+    use_snippet: bool,
+    cluster_sizes: Optional[Sequence[int]] = None,
+    results: Optional[Sequence[SentimentResult]] = None,
+) -> Tuple[List[ScoredItem], Dict[str, int]]:
+    texts: List[str] = []
+    used_by_item: List[str] = []
+    for it in items:
+        text, used = _text_for(it, use_snippet)
+        texts.append(text)
+        used_by_item.append(used)
+
+    # One batched pass over every item instead of one forward pass per headline
+    if results is None:
+        results = predict_sentiment_batch(texts)
+
+    scored: List[ScoredItem] = []
+    counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
+
+    sizes = cluster_sizes if cluster_sizes is not None else [1] * len(items)
+    for it, used, s, n in zip(items, used_by_item, results, sizes):
         counts[s.label] = counts.get(s.label, 0) + 1
 
         scored.append(
@@ -96,8 +202,400 @@ def scan_topic(
                 published_raw=clean_text(it.published_raw),
                 published_dt=it.published_dt,
                 used=used,
+                cluster_size=n,
             )
         )
 
+    return scored, counts
+
+
+def _cascade_pick(
+    items_by_topic: Mapping[str, Sequence[FeedItem]],
+    use_snippet: bool,
+    budget: Optional[int],
+) -> Tuple[Optional[Set[str]], Dict[str, ScoredItem]]:
+    """
+    Cascade pre-pass: VADER-score every item, pick each topic's top `budget`
+    links for the model. Returns (picked links, link -> VADER-labeled
+    ScoredItem for the rest), or (None, {}) when the cascade doesn't apply.
+    """
+    if not cascade_applies(budget):
+        return None, {}
+
+    with profiling.span("scan.prerank"):
+        unique = _dedupe_by_link(it for items in items_by_topic.values() for it in items)
+        pre = prerank([_text_for(it, use_snippet)[0] for it in unique])
+        by_link = {it.link.strip(): r for it, r in zip(unique, pre)}
+        picked = select_candidates(
+            {k: [it.link.strip() for it in items] for k, items in items_by_topic.items()},
+            by_link,
+            int(budget),  # type: ignore[arg-type]
+        )
+        cheap = [it for it in unique if it.link.strip() not in picked]
+        cheap_scored, _ = _score_items(cheap, use_snippet, results=[by_link[it.link.strip()] for it in cheap])
+
+    profiling.count("scan.cascade_to_model", len(unique) - len(cheap))
+    profiling.count("scan.cascade_skipped", len(cheap))
+    return picked, {it.link.strip(): s for it, s in zip(cheap, cheap_scored)}
+
+
+def _label_counts(items: Iterable[ScoredItem]) -> Dict[str, int]:
+    counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
+    for s in items:
+        counts[s.label] = counts.get(s.label, 0) + 1
+    return counts
+
+
+def _count_stages(fetched: int, deduped: int, filtered: int, scored: int) -> None:
+    profiling.count("scan.items_fetched", fetched)
+    profiling.count("scan.items_deduped", deduped)
+    profiling.count("scan.items_in_window", filtered)
+    profiling.count("scan.items_scored", scored)
+
+
+def scan_topic(
+    topic_key: str,
+    top_k: int = 6,
+    use_snippet: bool = True,
+    since_dt: Optional[datetime] = None,
+    until_dt: Optional[datetime] = None,
+    item_filter: Optional[ItemFilter] = None,
+    near_dedupe: bool = NEARDUP_ENABLED,
+    store: Optional["HeadlineStore"] = None,
+    log: Optional["DailyLogWriter"] = None,
+    cascade_budget: Optional[int] = CASCADE_BUDGET_PER_TOPIC if CASCADE_ENABLED else None,
+) -> Tuple[List[ScoredItem], Dict[str, int]]:
+    """
+    Top `top_k` scored headlines for one topic, plus label counts over all of
+    its items. With `cascade_budget`, only that many VADER-preranked
+    candidates reach the model; the returned (and stored) items are those,
+    while counts also include the VADER-only labels.
+
+    `store` and `log` (a DailyLogWriter) receive every scored item, not
+    just the top_k.
+
+    Items rejected by `item_filter` are dropped before scoring (a seen
+    link drops its whole near-duplicate cluster); since_dt / until_dt alone are shorthand for an ItemFilter with
+    that window (undated items dropped).
+    """
+    feed_urls = topic_feed_urls(topic_key)
+    flt = item_filter or ItemFilter(since_dt, until_dt)
+
+    # Fetch concurrently; results come back in feed_urls order so dedupe
+    # keeps the same "first seen wins" behavior as a sequential loop. Each
+    # feed is deduped and filtered as it arrives, so only the kept
+    # items stay in memory rather than every raw item of every feed.
+    seen: set = set()
+    filtered: List[FeedItem] = []
+    n_fetched = n_deduped = 0
+    feeds_iter = iter_many(feed_urls)
+    while True:
+        with profiling.span("scan.fetch"):
+            feed_items = next(feeds_iter, None)
+        if feed_items is None:
+            break
+        n_fetched += len(feed_items)
+
+        with profiling.span("scan.dedupe"):
+            fresh = _dedupe_by_link(feed_items, seen)
+        n_deduped += len(fresh)
+
+        # Window / seen / blocklist filters BEFORE sentiment scoring
+        with profiling.span("scan.filter"):
+            filtered.extend(flt.apply(fresh))
+
+    # Syndicated copies of one story: score a single representative
+    with profiling.span("scan.cluster"):
+        reps, sizes = _cluster(filtered, near_dedupe, flt)
+
+    picked, cheap = _cascade_pick({topic_key: reps}, use_snippet, cascade_budget)
+    if picked is None:
+        with profiling.span("scan.score"):
+            scored, counts = _score_items(reps, use_snippet, sizes)
+    else:
+        to_model = [(it, n) for it, n in zip(reps, sizes) if it.link.strip() in picked]
+        with profiling.span("scan.score"):
+            scored, _ = _score_items([it for it, _ in to_model], use_snippet, [n for _, n in to_model])
+        counts = _label_counts(scored + list(cheap.values()))
+    _count_stages(n_fetched, n_deduped, sum(sizes), len(scored))
+
+    if store is not None:
+        with profiling.span("scan.store"):
+            store.upsert(topic_key, scored)
+    if log is not None:
+        log.log_items(topic_key, scored)
     scored.sort(key=lambda x: x.confidence, reverse=True)
     return scored[:top_k], counts
+
+
+@dataclass(slots=True)
+class _PreparedTopic:
+    """One topic, fetched, filtered and clustered, ready to be scored."""
+
+    key: str
+    n_fetched: int
+    n_deduped: int
+    reps: List[FeedItem]
+    sizes: List[int]
+    n_filtered: int
+    picked: Optional[Set[str]]
+    cheap: Dict[str, ScoredItem]
+    fetch_s: float
+    prep_s: float
+
+
+def _prepare_topics(
+    keys: Sequence[str],
+    urls_by_topic: Mapping[str, Sequence[str]],
+    unique_urls: Sequence[str],
+    flt: ItemFilter,
+    near_dedupe: bool,
+    use_snippet: bool,
+    cascade_budget: Optional[int],
+) -> Iterator[_PreparedTopic]:
+    # Everything before model scoring; each topic only depends on its own
+    # feeds, so this can run ahead of the scoring loop
+    fetched: Dict[str, List[FeedItem]] = {}
+    feeds_iter = iter(zip(unique_urls, iter_many(unique_urls)))
+    # A feed's raw items are dropped after the last topic that uses it
+    last_use = {u: i for i, k in enumerate(keys) for u in urls_by_topic[k]}
+
+    for i, k in enumerate(keys):
+        # Feeds arrive in unique_urls order, which is topic order
+        t0 = time.perf_counter()
+        with profiling.span("scan.fetch"):
+            while not all(u in fetched for u in urls_by_topic[k]):
+                url, feed_items = next(feeds_iter)
+                fetched[url] = feed_items
+        t1 = time.perf_counter()
+
+        # Per-topic dedupe + filters + clustering, exactly like scan_topic
+        items: List[FeedItem] = []
+        for url in urls_by_topic[k]:
+            items.extend(fetched[url])
+        for url in urls_by_topic[k]:
+            if last_use[url] == i:
+                fetched.pop(url, None)
+        with profiling.span("scan.dedupe"):
+            deduped = _dedupe_by_link(items)
+        with profiling.span("scan.filter"):
+            filtered = flt.apply(deduped)
+        with profiling.span("scan.cluster"):
+            reps, sizes = _cluster(filtered, near_dedupe, flt)
+        picked, cheap = _cascade_pick({k: reps}, use_snippet, cascade_budget)
+
+        yield _PreparedTopic(
+            key=k,
+            n_fetched=len(items),
+            n_deduped=len(deduped),
+            reps=reps,
+            sizes=sizes,
+            n_filtered=sum(sizes),
+            picked=picked,
+            cheap=cheap,
+            fetch_s=t1 - t0,
+            prep_s=time.perf_counter() - t1,
+        )
+
+
+def iter_scan_topics(
+    topic_keys: Optional[Sequence[str]] = None,
+    top_k: int = 6,
+    use_snippet: bool = True,
+    since_dt: Optional[datetime] = None,
+    until_dt: Optional[datetime] = None,
+    item_filter: Optional[ItemFilter] = None,
+    near_dedupe: bool = NEARDUP_ENABLED,
+    known: Optional[MutableMapping[str, ScoredItem]] = None,
+    store: Optional["HeadlineStore"] = None,
+    log: Optional["DailyLogWriter"] = None,
+    cascade_budget: Optional[int] = CASCADE_BUDGET_PER_TOPIC if CASCADE_ENABLED else None,
+    stats: Optional[Dict[str, int]] = None,
+    prepare_ahead: int = SCAN_PREPARE_AHEAD,
+) -> Iterator[Tuple[str, List[ScoredItem], Dict[str, int]]]:
+    """
+    Scan several topics in one shared pass, yielding (topic_key, items,
+    counts) for each topic in `topic_keys` order as soon as it is done.
+
+    Every feed URL is fetched once, a few feeds ahead of the topic being
+    prepared (see iter_many). Preparing a topic (fetch, dedupe, filter, cluster, cascade
+    pre-rank) runs on a background thread up to `prepare_ahead` topics ahead
+    of scoring, so topic N+1 is being prepared while topic N is on the model.
+    Model scoring, `known`, the store and the log are only touched from the
+    calling thread.
+
+    Every unique link is scored once: a link already scored for an earlier
+    topic (or found in `known`, e.g. from an earlier watch cycle) is reused.
+    Newly scored items are added to `known`. With a `store`, every scored
+    item (not just the top_k) is upserted into it per topic before the topic
+    is yielded; with a `log`, those not reused from `known` are queued for
+    the daily log, so watch cycles don't log the same items again.
+
+    `cascade_budget` works as in scan_topic, per topic: only the topic's own
+    picks are model-scored (or reused), ranked, stored and remembered in
+    `known`.
+
+    `item_filter` (or since_dt / until_dt) rejects items before anything is
+    scored, as in scan_topic; stats count the rejections per reason.
+
+    `stats`, if given, is filled in once the last topic is done; see
+    scan_all_topics.
+    """
+    keys = list(topic_keys) if topic_keys is not None else list(TOPICS.keys())
+    flt = item_filter or ItemFilter(since_dt, until_dt)
+    rejected_before = dict(flt.rejected)
+    urls_by_topic = {k: topic_feed_urls(k) for k in keys}
+
+    all_urls = [u for k in keys for u in urls_by_topic[k]]
+    unique_urls = dedupe_keep_order(all_urls)
+    prepared = iter_ahead(
+        _prepare_topics(keys, urls_by_topic, unique_urls, flt, near_dedupe, use_snippet, cascade_budget),
+        depth=prepare_ahead,
+        name="scan-prepare",
+    )
+
+    by_link: Dict[str, ScoredItem] = {}  # model labels: scored this pass or reused
+    reused_links: Set[str] = set()
+    seen_links: Set[str] = set()
+    seen_texts: Set[str] = set()
+    near_dupes = n_fetched = n_deduped = n_filtered = 0
+    n_new = per_topic_items = per_topic_texts = 0
+    fetch_s = prep_s = score_s = 0.0
+
+    for topic in prepared:
+        k, reps, sizes, picked, cheap = topic.key, topic.reps, topic.sizes, topic.picked, topic.cheap
+        near_dupes += topic.n_filtered - len(reps)
+        n_fetched += topic.n_fetched
+        n_deduped += topic.n_deduped
+        n_filtered += topic.n_filtered
+        fetch_s += topic.fetch_s
+        prep_s += topic.prep_s
+        t2 = time.perf_counter()
+
+        # A topic ranks only its own cascade picks, never links another
+        # topic picked (in this pass or an earlier cycle), so its result
+        # doesn't depend on topic order or on what `known` holds
+        model_links: Set[str] = set()
+        to_score: List[FeedItem] = []
+        for it in _dedupe_by_link(reps):
+            link = it.link.strip()
+            if picked is not None and link not in picked:
+                continue
+            model_links.add(link)
+            if link in by_link:
+                continue
+            if known is not None and link in known:
+                by_link[link] = known[link]
+                reused_links.add(link)
+            else:
+                to_score.append(it)
+
+        with profiling.span("scan.score"):
+            scored_items, _ = _score_items(to_score, use_snippet)
+        _count_stages(topic.n_fetched, topic.n_deduped, topic.n_filtered, len(to_score))
+        for it, s in zip(to_score, scored_items):
+            by_link[it.link.strip()] = s
+            if known is not None:
+                known[it.link.strip()] = s
+        n_new += len(to_score)
+
+        scored: List[ScoredItem] = []
+        fresh: List[ScoredItem] = []  # not reused from `known`
+        all_labels: List[ScoredItem] = []
+        for it, n in zip(reps, sizes):
+            link = it.link.strip()
+            if link not in model_links:
+                all_labels.append(cheap[link])
+                continue
+            s = replace(by_link[link], cluster_size=n)
+            scored.append(s)
+            all_labels.append(s)
+            if link not in reused_links:
+                fresh.append(s)
+        counts = _label_counts(all_labels)
+        if store is not None:
+            with profiling.span("scan.store"):
+                store.upsert(k, scored)
+        if log is not None:
+            # Items reused from `known` were logged by the cycle that scored them
+            log.log_items(k, fresh)
+        scored.sort(key=lambda x: x.confidence, reverse=True)
+        score_s += time.perf_counter() - t2
+
+        # Inference runs once per distinct text in a predict_sentiment_batch
+        # call, so a per-topic scan pays for the distinct texts of each
+        # topic's model-scored items.
+        texts = {clean_text(_text_for(it, use_snippet)[0]) for it in reps if it.link.strip() in model_links}
+        per_topic_items += len(reps)
+        per_topic_texts += len(texts)
+        seen_texts |= texts
+        seen_links.update(it.link.strip() for it in reps)
+
+        yield k, scored[:top_k], counts
+
+    profiling.count("scan.items_reused", len(reused_links))
+    if stats is not None:
+        stats.update(
+            {
+                "feeds_total": len(all_urls),
+                "feeds_fetched": len(unique_urls),
+                "fetches_saved": len(all_urls) - len(unique_urls),
+                "items_per_topic_total": per_topic_items,
+                "items_scored": len(by_link),
+                "duplicate_items_saved": per_topic_items - len(seen_links),
+                "near_duplicates_merged": near_dupes,
+                "inference_saved": per_topic_texts - len(seen_texts),
+                "items_new": n_new,
+                "items_reused": len(reused_links),
+                "cascade_skipped": len(seen_links) - len(by_link),
+                "fetch_ms": int(1000 * fetch_s),
+                "prep_ms": int(1000 * prep_s),
+                "score_ms": int(1000 * score_s),
+            }
+        )
+        for reason in REJECT_REASONS:
+            stats[f"rejected_{reason}"] = flt.rejected.get(reason, 0) - rejected_before.get(reason, 0)
+
+
+def scan_all_topics(
+    topic_keys: Optional[Sequence[str]] = None,
+    top_k: int = 6,
+    use_snippet: bool = True,
+    since_dt: Optional[datetime] = None,
+    until_dt: Optional[datetime] = None,
+    item_filter: Optional[ItemFilter] = None,
+    near_dedupe: bool = NEARDUP_ENABLED,
+    known: Optional[MutableMapping[str, ScoredItem]] = None,
+    store: Optional["HeadlineStore"] = None,
+    log: Optional["DailyLogWriter"] = None,
+    cascade_budget: Optional[int] = CASCADE_BUDGET_PER_TOPIC if CASCADE_ENABLED else None,
+) -> Tuple[Dict[str, Tuple[List[ScoredItem], Dict[str, int]]], Dict[str, int]]:
+    """
+    Scan several topics in one pass (iter_scan_topics, collected).
+
+    Each topic gets the same (items, counts) that scan_topic would return
+    for it. Returns (per_topic, stats). stats reports how much work sharing
+    saved compared with calling scan_topic once per topic, plus time spent
+    fetching and preparing (on the prepare-ahead thread, overlapping with
+    scoring) and scoring. With a cascade, items_scored and inference_saved
+    only cover model-scored items; cascade_skipped counts the VADER-only ones.
+    """
+    stats: Dict[str, int] = {}
+    per_topic = {
+        k: (items, counts)
+        for k, items, counts in iter_scan_topics(
+            topic_keys,
+            top_k=top_k,
+            use_snippet=use_snippet,
+            since_dt=since_dt,
+            until_dt=until_dt,
+            item_filter=item_filter,
+            near_dedupe=near_dedupe,
+            known=known,
+            store=store,
+            log=log,
+            cascade_budget=cascade_budget,
+            stats=stats,
+        )
+    }
+    return per_topic, stats
@@ -1,11 +1,31 @@
 from __future__ import annotations
 
+import hashlib
+import inspect
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
-from .config import MODEL_NAME, USE_SAFETENSORS, SentimentResult
+from . import profiling
+from .config import (
+    MODEL_NAME,
+    ONNX_EXPORT_DIR,
+    SENTIMENT_BACKEND,
+    SENTIMENT_BATCH_SIZE,
+    SENTIMENT_CACHE_ENABLED,
+    SENTIMENT_CACHE_MAX_ENTRIES,
+    SENTIMENT_CACHE_PATH,
+    SENTIMENT_MAX_LENGTH,
+    SENTIMENT_WORKERS,
+    USE_SAFETENSORS,
+    SentimentResult,
+)
 from .util import clean_text
 
 
@@ -14,6 +34,9 @@ _TOKENIZER = None
 _MODEL = None
 _MODEL_ID2LABEL = None
 _USING_FALLBACK = False
+_CACHE: Optional["SentimentCache"] = None
+_BACKEND: Optional["SentimentBackend"] = None
+_BACKEND_LOCK = threading.Lock()
 
 
 def _try_load_finbert() -> bool:
@@ -39,56 +62,557 @@ def _try_load_finbert() -> bool:
         return False
 
 
-def _ensure_model_loaded() -> None:
-    global _TOKENIZER, _MODEL
-    if _TOKENIZER is not None and _MODEL is not None:
-        return
-    _try_load_finbert()
+class SentimentCache:
+    """
+    SQLite-backed LRU cache of sentiment results.
 
+    Rows are keyed by (backend, sha1(cleaned text)), so a result scored by
+    one model (or by the VADER fallback) is never served for another.
+    """
 
-def _vader(text: str) -> SentimentResult:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    def __init__(self, path: str, max_entries: int = 50000) -> None:
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
 
-    analyzer = SentimentIntensityAnalyzer()
-    score = analyzer.polarity_scores(text).get("compound", 0.0)
-    # map to 3-class
-    if score >= 0.05:
-        return SentimentResult("Positive", float(min(1.0, abs(score))))
-    if score <= -0.05:
-        return SentimentResult("Negative", float(min(1.0, abs(score))))
-    return SentimentResult("Neutral", float(1.0 - abs(score)))
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sentiment_cache (
+                backend TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                label TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (backend, text_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sentiment_cache_last_used ON sentiment_cache(last_used)"
+        )
+        self._conn.commit()
 
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
 
-def predict_sentiment(text: str) -> SentimentResult:
-    text = clean_text(text)
-    if not text:
-        return SentimentResult("Neutral", 0.0)
+    def get_many(self, backend: str, hashes: Sequence[str]) -> Dict[str, SentimentResult]:
+        found: Dict[str, SentimentResult] = {}
+        uniq = list(dict.fromkeys(hashes))
+        if not uniq:
+            return found
+
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(uniq), 500):
+                chunk = uniq[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, label, confidence FROM sentiment_cache "
+                    f"WHERE backend = ? AND text_hash IN ({marks})",
+                    [backend, *chunk],
+                ).fetchall()
+                for h, label, conf in rows:
+                    found[h] = SentimentResult(label, float(conf))
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE sentiment_cache SET last_used = ? WHERE backend = ? AND text_hash = ?",
+                    [(now, backend, h) for h in found],
+                )
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(uniq) - len(found)
+        return found
+
+    def put_many(self, backend: str, entries: Dict[str, SentimentResult]) -> None:
+        if not entries:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sentiment_cache (backend, text_hash, label, confidence, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(backend, h, r.label, float(r.confidence), now) for h, r in entries.items()],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        (n,) = self._conn.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()
+        over = n - self.max_entries
+        if over > 0:
+            self._conn.execute(
+                "DELETE FROM sentiment_cache WHERE rowid IN "
+                "(SELECT rowid FROM sentiment_cache ORDER BY last_used ASC LIMIT ?)",
+                (over,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (n,) = self._conn.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()
+        return int(n)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def get_cache() -> Optional[SentimentCache]:
+    global _CACHE
+    if not SENTIMENT_CACHE_ENABLED:
+        return None
+    if _CACHE is None:
+        try:
+            _CACHE = SentimentCache(SENTIMENT_CACHE_PATH, SENTIMENT_CACHE_MAX_ENTRIES)
+        except Exception:
+            return None
+    return _CACHE
+
+
+def cache_stats() -> Dict[str, int]:
+    cache = get_cache()
+    if cache is None:
+        return {"hits": 0, "misses": 0, "entries": 0}
+    return cache.stats()
+
+
+def _normalize_label(label_raw: object) -> str:
+    label = str(label_raw).strip().capitalize()
+    # normalize common variants
+    if label.lower().startswith("pos"):
+        label = "Positive"
+    elif label.lower().startswith("neg"):
+        label = "Negative"
+    elif label.lower().startswith("neu"):
+        label = "Neutral"
+    return label
+
+
+class SentimentBackend(ABC):
+    """
+    Common interface for scoring backends.
+
+    `name` identifies who produced a score (it keys the cache), and
+    predict_batch returns one SentimentResult per input, in input order.
+    Inputs are already cleaned and non-empty.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def predict_batch(self, texts: Sequence[str], batch_size: int = SENTIMENT_BATCH_SIZE) -> List[SentimentResult]:
+        ...
+
+
+class FinBertBackend(SentimentBackend):
+    """fp32 PyTorch inference (the default)."""
+
+    kind = "torch"
+    _return_tensors = "pt"
+
+    def __init__(self, tokenizer, model, id2label: Optional[Dict[int, str]] = None) -> None:
+        # fp32 keeps the plain model name so existing cache entries stay valid
+        self.name = f"hf:{MODEL_NAME}" if self.kind == "torch" else f"hf:{MODEL_NAME}:{self.kind}"
+        self._tokenizer = tokenizer
+        self._model = model
+        id2label = {int(k): v for k, v in (id2label or {}).items()}
+        # Resolve labels once instead of per prediction
+        n_labels = max(id2label) + 1 if id2label else 0
+        self._labels = [_normalize_label(id2label.get(i, str(i))) for i in range(n_labels)]
+
+    def _label(self, idx: int) -> str:
+        return self._labels[idx] if idx < len(self._labels) else _normalize_label(idx)
 
-    _ensure_model_loaded()
+    def _forward(self, inputs) -> np.ndarray:
+        import torch
+
+        with torch.no_grad():
+            return self._model(**inputs).logits.detach().cpu().numpy()
+
+    def predict_batch(self, texts: Sequence[str], batch_size: int = SENTIMENT_BATCH_SIZE) -> List[SentimentResult]:
+        texts = list(texts)
+        if not texts:
+            return []
+        batch_size = max(1, int(batch_size))
+
+        # Tokenize once without padding so we know each text's length, then build
+        # batches from length-sorted texts and pad each batch only to its own max.
+        with profiling.span("sentiment.tokenize"):
+            enc = self._tokenizer(texts, truncation=True, max_length=SENTIMENT_MAX_LENGTH)
+        keys = list(enc.keys())
+        order = sorted(range(len(texts)), key=lambda i: len(enc["input_ids"][i]))
+
+        out: List[Optional[SentimentResult]] = [None] * len(texts)
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            with profiling.span("sentiment.pad"):
+                features = [{k: enc[k][i] for k in keys} for i in chunk]
+                inputs = self._tokenizer.pad(features, padding=True, return_tensors=self._return_tensors)
+            with profiling.span("sentiment.inference"):
+                logits = self._forward(inputs)
+            profiling.count("sentiment.batches")
+
+            probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probs = probs / probs.sum(axis=1, keepdims=True)
+            idxs = probs.argmax(axis=1)
+
+            for row, i in enumerate(chunk):
+                idx = int(idxs[row])
+                out[i] = SentimentResult(self._label(idx), float(probs[row, idx]))
+
+        return out  # type: ignore[return-value]
+
+
+class QuantizedFinBertBackend(FinBertBackend):
+    """PyTorch with Linear layers dynamically quantized to int8."""
+
+    kind = "torch-int8"
+
+    def __init__(self, tokenizer, model, id2label: Optional[Dict[int, str]] = None) -> None:
+        import torch
+
+        qmodel = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        qmodel.eval()
+        super().__init__(tokenizer, qmodel, id2label)
 
-    if _TOKENIZER is None or _MODEL is None:
-        return _vader(text)
+
+def _onnx_path() -> str:
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in MODEL_NAME)
+    return os.path.join(ONNX_EXPORT_DIR, safe, "model.onnx")
+
+
+def _export_onnx(tokenizer, model) -> str:
+    # Exported once per model; later runs only load the .onnx file
+    path = _onnx_path()
+    if os.path.exists(path):
+        return path
 
     import torch
 
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    enc = tokenizer(["gold price rises"], return_tensors="pt")
+    # Graph inputs must follow forward()'s parameter order, not the tokenizer's
+    names = [n for n in inspect.signature(model.forward).parameters if n in enc]
+    dummy = {n: enc[n] for n in names}
+    axes = {n: {0: "batch", 1: "seq"} for n in names}
+    axes["logits"] = {0: "batch"}
+
+    tmp = f"{path}.tmp"
     with torch.no_grad():
-        inputs = _TOKENIZER(text, return_tensors="pt", truncation=True, max_length=256)
-        outputs = _MODEL(**inputs)
-        logits = outputs.logits.detach().cpu().numpy().reshape(-1)
-        probs = np.exp(logits - np.max(logits))
-        probs = probs / probs.sum()
-
-        idx = int(probs.argmax())
-        conf = float(probs[idx])
-
-        label_raw = _MODEL_ID2LABEL.get(idx, str(idx)) if _MODEL_ID2LABEL else str(idx)
-        label = str(label_raw).strip().capitalize()
-        # normalize common variants
-        if label.lower().startswith("pos"):
-            label = "Positive"
-        elif label.lower().startswith("neg"):
-            label = "Negative"
-        elif label.lower().startswith("neu"):
-            label = "Neutral"
-
-        return SentimentResult(label, conf)
+        torch.onnx.export(
+            model,
+            args=(),
+            kwargs=dummy,
+            f=tmp,
+            input_names=names,
+            output_names=["logits"],
+            dynamic_axes=axes,
+            opset_version=17,
+            dynamo=False,
+        )
+    os.replace(tmp, path)
+    return path
+
+
+class OnnxFinBertBackend(FinBertBackend):
+    """The model exported to ONNX and run with ONNX Runtime on CPU."""
+
+    kind = "onnx"
+    _return_tensors = "np"
+
+    def __init__(self, tokenizer, model, id2label: Optional[Dict[int, str]] = None) -> None:
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(
+            _export_onnx(tokenizer, model),
+            sess_options=opts,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = [i.name for i in self._session.get_inputs()]
+        # The torch weights aren't needed once the graph is loaded
+        super().__init__(tokenizer, None, id2label)
+
+    def _forward(self, inputs) -> np.ndarray:
+        feed = {n: np.asarray(inputs[n], dtype=np.int64) for n in self._input_names if n in inputs}
+        return self._session.run(None, feed)[0]
+
+
+HF_BACKENDS = {
+    b.kind: b for b in (FinBertBackend, QuantizedFinBertBackend, OnnxFinBertBackend)
+}
+
+
+def _build_hf_backend(kind: str, tokenizer, model, id2label, strict: bool = False) -> FinBertBackend:
+    cls = HF_BACKENDS.get(kind)
+    if cls is None:
+        if strict:
+            raise ValueError(f"Unknown SENTIMENT_BACKEND {kind!r}; choose from {sorted(HF_BACKENDS)}")
+        cls = FinBertBackend
+    try:
+        return cls(tokenizer, model, id2label)
+    except Exception:
+        # Missing onnxruntime / quantization support: fp32 still works
+        if strict or cls is FinBertBackend:
+            raise
+        return FinBertBackend(tokenizer, model, id2label)
+
+
+class VaderBackend(SentimentBackend):
+    """
+    Offline fallback. The analyzer (and its lexicon) is built once and reused;
+    the compound -> 3-class mapping runs vectorized over the whole batch.
+    """
+
+    name = "vader"
+
+    def __init__(self) -> None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+        self._analyzer = SentimentIntensityAnalyzer()
+        self._polarity = self._analyzer.polarity_scores
+
+    def compound_scores(self, texts: Sequence[str]) -> np.ndarray:
+        polarity = self._polarity
+        return np.fromiter(
+            (polarity(t).get("compound", 0.0) for t in texts),
+            dtype=np.float64,
+            count=len(texts),
+        )
+
+    def predict_batch(self, texts: Sequence[str], batch_size: int = SENTIMENT_BATCH_SIZE) -> List[SentimentResult]:
+        if not texts:
+            return []
+
+        score = self.compound_scores(texts)
+        mag = np.abs(score)
+        pos = score >= 0.05
+        neg = score <= -0.05
+
+        # map to 3-class
+        conf = np.where(pos | neg, np.minimum(1.0, mag), 1.0 - mag)
+        labels = np.where(pos, "Positive", np.where(neg, "Negative", "Neutral"))
+        return [SentimentResult(str(l), float(c)) for l, c in zip(labels.tolist(), conf.tolist())]
+
+
+def load_in_process_backend() -> SentimentBackend:
+    """FinBERT (in the SENTIMENT_BACKEND flavor) if it loads, otherwise VADER."""
+    global _MODEL
+    with profiling.span("sentiment.model_load"):
+        if _try_load_finbert():
+            backend = _build_hf_backend(SENTIMENT_BACKEND, _TOKENIZER, _MODEL, _MODEL_ID2LABEL)
+            # Keep only the backend's own weights resident (int8 / ONNX
+            # don't need the fp32 copy)
+            _MODEL = backend._model
+            return backend
+        return VaderBackend()
+
+
+def get_backend() -> SentimentBackend:
+    """
+    Load the scoring backend once per process. With SENTIMENT_WORKERS > 1
+    the model runs in a worker pool (see workers.py); if the pool can't
+    start, or otherwise, it is loaded in-process.
+    """
+    global _BACKEND
+    if _BACKEND is not None:
+        return _BACKEND
+
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            backend: Optional[SentimentBackend] = None
+            if SENTIMENT_WORKERS > 1:
+                # Imported here: workers imports this module
+                from .workers import start_worker_pool
+
+                with profiling.span("sentiment.worker_start"):
+                    backend = start_worker_pool(SENTIMENT_WORKERS)
+            _BACKEND = backend or load_in_process_backend()
+    return _BACKEND
+
+
+def shutdown_backend() -> None:
+    """Stop worker processes, if any; the next get_backend() starts over."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        backend, _BACKEND = _BACKEND, None
+    close = getattr(backend, "close", None)
+    if close is not None:
+        close()
+
+
+def predict_sentiment_batch(
+    texts: Sequence[str],
+    batch_size: int = SENTIMENT_BATCH_SIZE,
+    backend: Optional[SentimentBackend] = None,
+) -> List[SentimentResult]:
+    """
+    Score many texts with as few forward passes as possible.
+    Results come back in the same order as `texts`. `backend` defaults to
+    get_backend(); results are cached per backend either way.
+    """
+    cleaned = [clean_text(t) for t in texts]
+    out: List[SentimentResult] = [SentimentResult("Neutral", 0.0)] * len(cleaned)
+
+    todo = [i for i, t in enumerate(cleaned) if t]
+    if not todo:
+        return out
+
+    backend = backend or get_backend()
+
+    # Identical texts in one call are scored once
+    by_text: Dict[str, List[int]] = {}
+    for i in todo:
+        by_text.setdefault(cleaned[i], []).append(i)
+
+    profiling.count("sentiment.texts", len(todo))
+    profiling.count("sentiment.duplicate_texts", len(todo) - len(by_text))
+
+    cache = get_cache()
+    hashes = {t: SentimentCache.text_hash(t) for t in by_text}
+    with profiling.span("sentiment.cache_get"):
+        cached = cache.get_many(backend.name, list(hashes.values())) if cache is not None else {}
+
+    scored: Dict[str, SentimentResult] = {}
+    missing: List[str] = []
+    for t, h in hashes.items():
+        if h in cached:
+            scored[t] = cached[h]
+        else:
+            missing.append(t)
+
+    if cache is not None:
+        profiling.count("sentiment.cache_hits", len(scored))
+        profiling.count("sentiment.cache_misses", len(missing))
+
+    if missing:
+        with profiling.span(f"sentiment.predict[{backend.name}]"):
+            fresh = backend.predict_batch(missing, batch_size)
+        profiling.count("sentiment.scored", len(missing))
+        scored.update(zip(missing, fresh))
+        if cache is not None:
+            with profiling.span("sentiment.cache_put"):
+                cache.put_many(backend.name, {hashes[t]: r for t, r in zip(missing, fresh)})
+
+    for t, idxs in by_text.items():
+        for i in idxs:
+            out[i] = scored[t]
+    return out
+
+
+def predict_sentiment(text: str) -> SentimentResult:
+    return predict_sentiment_batch([text])[0]
+
+
+# ==========================
+# Backend comparison
+# ==========================
+SAMPLE_HEADLINES = [
+    "Gold hits record high as Fed rate-cut bets grow",
+    "Oil prices slide as OPEC+ weighs output hike",
+    "Nvidia shares jump after strong AI chip demand forecast",
+    "Bitcoin falls below $60,000 as ETF outflows mount",
+    "Stocks little changed ahead of inflation data",
+    "China economy slows more than expected in second quarter",
+    "Exxon beats profit estimates on higher refining margins",
+    "Coinbase shares tumble after SEC lawsuit",
+    "Treasury yields steady as investors await Fed minutes",
+    "European markets close higher, led by mining stocks",
+]
+
+
+def compare_backends(
+    texts: Sequence[str],
+    kinds: Sequence[str] = ("torch", "torch-int8", "onnx"),
+    batch_size: int = SENTIMENT_BATCH_SIZE,
+) -> List[Dict[str, object]]:
+    """
+    Accuracy-vs-latency check of the HF backends against fp32 torch labels.
+
+    Each row has the backend, ms per item, label agreement with fp32, and
+    the largest confidence difference. A backend that can't load reports
+    an "error" instead.
+    """
+    if not _try_load_finbert():
+        raise RuntimeError(f"Could not load {MODEL_NAME}; nothing to compare.")
+
+    texts = [t for t in (clean_text(x) for x in texts) if t]
+    if not texts:
+        return []
+
+    tokenizer, model, id2label = _TOKENIZER, _MODEL, _MODEL_ID2LABEL
+    order = ["torch"] + [k for k in kinds if k != "torch"]
+
+    rows: List[Dict[str, object]] = []
+    reference: Optional[List[SentimentResult]] = None
+    for kind in order:
+        try:
+            backend = _build_hf_backend(kind, tokenizer, model, id2label, strict=True)
+        except Exception as e:
+            rows.append({"backend": kind, "error": f"{type(e).__name__}: {e}"})
+            continue
+
+        backend.predict_batch(texts[:batch_size], batch_size)  # warm-up
+        t0 = time.perf_counter()
+        results = backend.predict_batch(texts, batch_size)
+        elapsed = time.perf_counter() - t0
+
+        if reference is None:
+            reference = results
+        agree = sum(a.label == b.label for a, b in zip(results, reference)) / len(texts)
+        delta = max(abs(a.confidence - b.confidence) for a, b in zip(results, reference))
+        rows.append(
+            {
+                "backend": kind,
+                "ms_per_item": round(1000.0 * elapsed / len(texts), 3),
+                "label_agreement": round(agree, 4),
+                "max_conf_delta": round(delta, 4),
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare sentiment inference backends against fp32")
+    parser.add_argument("--file", help="headlines to score, one per line (default: built-in sample)")
+    parser.add_argument("--repeat", type=int, default=20, help="repeat the sample to get stable timings")
+    parser.add_argument("--batch-size", type=int, default=SENTIMENT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = SAMPLE_HEADLINES * max(1, args.repeat)
+
+    print(f"{MODEL_NAME} on {len(texts)} texts")
+    for row in compare_backends(texts, batch_size=args.batch_size):
+        if "error" in row:
+            print(f"- {row['backend']:11} unavailable ({row['error']})")
+            continue
+        print(
+            f"- {row['backend']:11} {row['ms_per_item']:8.3f} ms/item | "
+            f"label agreement {row['label_agreement']:.2%} | max conf delta {row['max_conf_delta']:.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
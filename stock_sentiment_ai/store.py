@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from .batch import ItemBatch
+from .config import HEADLINE_STORE_ENABLED, HEADLINE_STORE_PATH
+from .scanner import ScoredItem
+
+# Local history of scored headlines.
+#
+# Every scan upserts its scored items per topic, so headlines survive after
+# they drop out of the live RSS feeds. `briefing --from-store` renders the
+# windows (preopen / last24) from this history as indexed range queries over
+# (topic, published_ts); live briefings report the current scan.
+
+
+def _to_ts(dt: Optional[datetime]) -> Optional[int]:
+    return int(dt.timestamp()) if dt is not None else None
+
+
+def _from_ts(ts: Optional[int]) -> Optional[datetime]:
+    return datetime.fromtimestamp(ts, tz=timezone.utc) if ts is not None else None
+
+
+class HeadlineStore:
+    def __init__(self, path: str = HEADLINE_STORE_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS headlines (
+                topic TEXT NOT NULL,
+                link TEXT NOT NULL,
+                label TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                title TEXT NOT NULL,
+                source TEXT NOT NULL,
+                author TEXT NOT NULL,
+                published_raw TEXT NOT NULL,
+                published_ts INTEGER,
+                used TEXT NOT NULL,
+                cluster_size INTEGER NOT NULL DEFAULT 1,
+                first_seen_ts INTEGER NOT NULL,
+                last_seen_ts INTEGER NOT NULL,
+                PRIMARY KEY (topic, link)
+            );
+            CREATE INDEX IF NOT EXISTS idx_headlines_topic_published ON headlines(topic, published_ts);
+            CREATE INDEX IF NOT EXISTS idx_headlines_link ON headlines(link);
+            CREATE INDEX IF NOT EXISTS idx_headlines_topic_undated
+                ON headlines(topic, last_seen_ts) WHERE published_ts IS NULL;
+            """
+        )
+        self._conn.commit()
+
+    def upsert(self, topic: str, items: Iterable[ScoredItem]) -> int:
+        now = int(time.time())
+        rows = [
+            (
+                topic,
+                it.link,
+                it.label,
+                float(it.confidence),
+                it.title,
+                it.source,
+                it.author,
+                it.published_raw,
+                _to_ts(it.published_dt),
+                it.used,
+                int(it.cluster_size),
+                now,
+                now,
+            )
+            for it in items
+        ]
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO headlines (
+                    topic, link, label, confidence, title, source, author,
+                    published_raw, published_ts, used, cluster_size, first_seen_ts, last_seen_ts
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(topic, link) DO UPDATE SET
+                    label = excluded.label,
+                    confidence = excluded.confidence,
+                    title = excluded.title,
+                    source = excluded.source,
+                    author = excluded.author,
+                    published_raw = excluded.published_raw,
+                    published_ts = excluded.published_ts,
+                    used = excluded.used,
+                    cluster_size = excluded.cluster_size,
+                    last_seen_ts = excluded.last_seen_ts
+                """,
+                rows,
+            )
+            self._conn.commit()
+        return len(rows)
+
+    @staticmethod
+    def _window_sql(
+        columns: str,
+        topic: str,
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime],
+        keep_unknown: bool,
+    ) -> tuple:
+        """
+        SELECT `columns` for `topic` within the window. Dated and undated
+        items are separate branches joined with UNION ALL, so each one stays
+        a single indexed range scan.
+        """
+        base = f"SELECT {columns} FROM headlines WHERE topic = ?"
+        if not start_dt or not end_dt:
+            return base, [topic]
+
+        lo, hi = _to_ts(start_dt), _to_ts(end_dt)
+        sql = f"{base} AND published_ts BETWEEN ? AND ?"
+        params: List[object] = [topic, lo, hi]
+        if keep_unknown:
+            # Undated items count as in-window while we're still seeing them,
+            # so old undated history doesn't pile up in every briefing
+            sql += f" UNION ALL {base} AND published_ts IS NULL AND last_seen_ts BETWEEN ? AND ?"
+            params += [topic, lo, hi]
+        return sql, params
+
+    def _rows(
+        self,
+        topic: str,
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime],
+        limit: Optional[int],
+        keep_unknown: bool,
+    ) -> List[tuple]:
+        sql, args = self._window_sql(
+            "label, confidence, title, link, source, author, published_raw, published_ts, used, cluster_size",
+            topic,
+            start_dt,
+            end_dt,
+            keep_unknown,
+        )
+        sql += " ORDER BY confidence DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def query(
+        self,
+        topic: str,
+        start_dt: Optional[datetime] = None,
+        end_dt: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        keep_unknown: bool = True,
+    ) -> List[ScoredItem]:
+        """Items for `topic` in [start_dt, end_dt], highest confidence first."""
+        rows = self._rows(topic, start_dt, end_dt, limit, keep_unknown)
+        return [
+            ScoredItem(
+                label=label,
+                confidence=conf,
+                title=title,
+                link=link,
+                source=source,
+                author=author,
+                published_raw=raw,
+                published_dt=_from_ts(ts),
+                used=used,
+                cluster_size=n,
+            )
+            for label, conf, title, link, source, author, raw, ts, used, n in rows
+        ]
+
+    def query_batch(
+        self,
+        topic: str,
+        start_dt: Optional[datetime] = None,
+        end_dt: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        keep_unknown: bool = True,
+    ) -> ItemBatch:
+        """Same rows as query(), as a columnar ItemBatch (no per-row objects)."""
+        return ItemBatch.from_rows(self._rows(topic, start_dt, end_dt, limit, keep_unknown))
+
+    def label_counts(
+        self,
+        topic: str,
+        start_dt: Optional[datetime] = None,
+        end_dt: Optional[datetime] = None,
+        keep_unknown: bool = True,
+    ) -> Dict[str, int]:
+        sql, params = self._window_sql("label", topic, start_dt, end_dt, keep_unknown)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT label, COUNT(*) FROM ({sql}) GROUP BY label", params).fetchall()
+
+        counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
+        for label, n in rows:
+            counts[label] = counts.get(label, 0) + int(n)
+        return counts
+
+    def has_link(self, link: str, as_of: Optional[int] = None) -> bool:
+        """Whether `link` is stored (under any topic), optionally as of an earlier snapshot()."""
+        sql = "SELECT 1 FROM headlines WHERE link = ?"
+        args: List[object] = [link]
+        if as_of is not None:
+            sql += " AND rowid <= ?"
+            args.append(int(as_of))
+        with self._lock:
+            row = self._conn.execute(sql + " LIMIT 1", args).fetchone()
+        return row is not None
+
+    def snapshot(self) -> int:
+        """
+        A marker for the rows stored so far. Rows are never deleted and an
+        upsert keeps its row's rowid, so every row inserted after this point
+        has a larger rowid, however close together the calls are.
+        """
+        with self._lock:
+            (n,) = self._conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM headlines").fetchone()
+        return int(n)
+
+    def seen_before(self, as_of: Optional[int] = None) -> "SeenLinks":
+        """
+        Links already stored when a scan started (or at `as_of`, a
+        snapshot()), as a container for ItemFilter.seen_links; what the scan
+        itself stores doesn't count.
+        """
+        return SeenLinks(self, self.snapshot() if as_of is None else as_of)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SeenLinks:
+    __slots__ = ("_store", "_as_of")
+
+    def __init__(self, store: HeadlineStore, as_of: int) -> None:
+        self._store = store
+        self._as_of = as_of
+
+    def __contains__(self, link: object) -> bool:
+        # One indexed lookup per item
+        return isinstance(link, str) and self._store.has_link(link, self._as_of)
+
+
+_STORE: Optional[HeadlineStore] = None
+
+
+def get_store() -> Optional[HeadlineStore]:
+    global _STORE
+    if not HEADLINE_STORE_ENABLED:
+        return None
+    if _STORE is None:
+        try:
+            _STORE = HeadlineStore()
+        except Exception:
+            return None
+    return _STORE
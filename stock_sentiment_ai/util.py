@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import os
+import queue
 import re
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Iterable, List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
 
 
 def utc_now() -> datetime:
@@ -31,18 +36,116 @@ def dedupe_keep_order(items: Iterable[str]) -> List[str]:
     return out
 
 
+class LRUDict(OrderedDict):
+    """Dict capped at `max_items`; reads and writes refresh an entry, the oldest is evicted."""
+
+    def __init__(self, max_items: int = 10000) -> None:
+        super().__init__()
+        self.max_items = max(1, int(max_items))
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_items:
+            self.popitem(last=False)
+
+
 class SimpleRateLimiter:
     def __init__(self, min_interval_sec: float = 0.25) -> None:
         self.min_interval_sec = min_interval_sec
         self._last = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        # Held while sleeping so concurrent callers queue up one interval apart
+        with self._lock:
+            now = time.monotonic()
+            dt = now - self._last
+            if dt < self.min_interval_sec:
+                time.sleep(self.min_interval_sec - dt)
+            self._last = time.monotonic()
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket: `rate_per_sec` tokens refill continuously, up to
+    `capacity`. acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate_per_sec: float, capacity: Optional[float] = None) -> None:
+        self.rate_per_sec = float(rate_per_sec)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate_per_sec))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_sec)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate_per_sec
+            time.sleep(wait)
 
     def wait(self) -> None:
-        now = time.time()
-        dt = now - self._last
-        if dt < self.min_interval_sec:
-            time.sleep(self.min_interval_sec - dt)
-        self._last = time.time()
+        # Same call shape as SimpleRateLimiter
+        self.acquire()
 
 
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
+
+
+def iter_ahead(iterable: Iterable[T], depth: int = 1, name: str = "iter-ahead") -> Iterator[T]:
+    """
+    Iterate `iterable` on a background thread that stays at most `depth`
+    items ahead of the consumer. Exceptions are re-raised on the consumer
+    side; once the consumer stops, the producer quits at its next item.
+    depth <= 0 iterates inline.
+    """
+    if depth <= 0:
+        yield from iterable
+        return
+
+    q: "queue.Queue[Tuple[bool, object]]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(entry: Tuple[bool, object]) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run() -> None:
+        try:
+            for item in iterable:
+                if not put((True, item)):
+                    return
+            put((True, done))
+        except BaseException as e:
+            put((False, e))
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    try:
+        while True:
+            ok, item = q.get()
+            if not ok:
+                raise item  # type: ignore[misc]
+            if item is done:
+                return
+            yield item  # type: ignore[misc]
+    finally:
+        stop.set()
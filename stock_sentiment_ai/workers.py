@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import atexit
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from . import sentiment
+from .config import (
+    SENTIMENT_BACKEND,
+    SENTIMENT_BATCH_SIZE,
+    SENTIMENT_WORKER_START_TIMEOUT_SECS,
+    SENTIMENT_WORKER_THREADS,
+    SentimentResult,
+)
+
+# Multi-process sentiment scoring.
+#
+# Each worker process loads the model once (with its own torch thread count)
+# and scores shards of length-sorted batches; the parent reassembles results
+# in input order. Many short headlines parallelize far better across
+# processes than through one process's intra-op threads.
+#
+# Workers are started with "spawn" (torch and fork don't mix) and ignore
+# SIGINT, so Ctrl-C is handled once, by the parent, which then shuts the pool
+# down. If the pool can't start or breaks mid-run, scoring falls back to an
+# in-process backend.
+
+_WORKER_BACKEND: Optional[sentiment.SentimentBackend] = None
+
+
+def _worker_init(kind: str, threads: int, ready: "multiprocessing.Queue[tuple]") -> None:
+    global _WORKER_BACKEND
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        import torch
+
+        torch.set_num_threads(max(1, threads))
+        torch.set_num_interop_threads(1)
+    except Exception:
+        pass
+
+    if sentiment._try_load_finbert():
+        _WORKER_BACKEND = sentiment._build_hf_backend(
+            kind, sentiment._TOKENIZER, sentiment._MODEL, sentiment._MODEL_ID2LABEL
+        )
+    # Every process reports here once it's up, whether or not it ever gets
+    # a task, so the parent hears from each one
+    ready.put((os.getpid(), _WORKER_BACKEND.name if _WORKER_BACKEND is not None else ""))
+
+
+def _worker_predict(texts: List[str], batch_size: int) -> List[SentimentResult]:
+    if _WORKER_BACKEND is None:
+        raise RuntimeError("model not loaded in worker")
+    return _WORKER_BACKEND.predict_batch(texts, batch_size)
+
+
+def default_threads(workers: int) -> int:
+    return SENTIMENT_WORKER_THREADS or max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+class WorkerPoolBackend(sentiment.SentimentBackend):
+    """
+    SentimentBackend that shards batches across model-loading worker
+    processes. Its name is the workers' own backend name, so cache entries
+    are shared with in-process scoring of the same model.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        threads_per_worker: Optional[int] = None,
+        kind: str = SENTIMENT_BACKEND,
+    ) -> None:
+        self.workers = max(1, int(workers))
+        self.threads_per_worker = threads_per_worker or default_threads(self.workers)
+        self._fallback: Optional[sentiment.SentimentBackend] = None
+        self._lock = threading.Lock()
+        ctx = multiprocessing.get_context("spawn")
+        ready = ctx.Queue()
+        self._executor: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=ctx,
+            initializer=_worker_init,
+            initargs=(kind, self.threads_per_worker, ready),
+        )
+
+        try:
+            # Every process must come up with the same model, or we don't use
+            # the pool at all
+            names = set(self._await_workers(ready).values())
+        except Exception:
+            self.close()
+            raise
+        finally:
+            ready.close()
+        if len(names) != 1 or "" in names:
+            self.close()
+            raise RuntimeError(f"sentiment workers failed to load the model ({sorted(names)})")
+        self.name = names.pop()
+
+    def _await_workers(self, ready: "multiprocessing.Queue[tuple]") -> Dict[int, str]:
+        # The pool starts processes as tasks arrive, so submit one per slot;
+        # which processes are up comes from their own reports, not from
+        # which process happened to run which task
+        assert self._executor is not None
+        for _ in range(self.workers):
+            self._executor.submit(os.getpid)
+        deadline = time.monotonic() + SENTIMENT_WORKER_START_TIMEOUT_SECS
+        names: Dict[int, str] = {}
+        while len(names) < self.workers:
+            try:
+                pid, name = ready.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise TimeoutError(f"{len(names)}/{self.workers} sentiment workers started") from None
+            names[pid] = name
+        return names
+
+    def _shards(self, texts: Sequence[str], batch_size: int) -> List[List[int]]:
+        # Length-sorted batches, dealt out as contiguous runs so each worker
+        # pads against similar lengths; ~2 shards per worker evens out load.
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batches = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+        per_shard = max(1, math.ceil(len(batches) / (2 * self.workers)))
+        return [
+            [i for b in batches[s:s + per_shard] for i in b]
+            for s in range(0, len(batches), per_shard)
+        ]
+
+    def predict_batch(self, texts: Sequence[str], batch_size: int = SENTIMENT_BATCH_SIZE) -> List[SentimentResult]:
+        texts = list(texts)
+        if not texts:
+            return []
+        batch_size = max(1, int(batch_size))
+
+        executor = self._executor
+        if executor is not None:
+            try:
+                shards = self._shards(texts, batch_size)
+                futures = [executor.submit(_worker_predict, [texts[i] for i in s], batch_size) for s in shards]
+                out: List[Optional[SentimentResult]] = [None] * len(texts)
+                for shard, fut in zip(shards, futures):
+                    for i, r in zip(shard, fut.result()):
+                        out[i] = r
+                return out  # type: ignore[return-value]
+            except Exception:
+                # Broken pool (worker died, OOM, ...): stop using it
+                self.close()
+
+        return self._in_process().predict_batch(texts, batch_size)
+
+    def _in_process(self) -> sentiment.SentimentBackend:
+        with self._lock:
+            if self._fallback is None:
+                self._fallback = sentiment.load_in_process_backend()
+            return self._fallback
+
+    def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def start_worker_pool(workers: int, threads_per_worker: Optional[int] = None) -> Optional[WorkerPoolBackend]:
+    """A running pool, or None if it couldn't start (callers then score in-process)."""
+    try:
+        pool = WorkerPoolBackend(workers, threads_per_worker)
+    except Exception:
+        return None
+    atexit.register(pool.close)
+    return pool
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import gzip
+import os
+import zlib
+from pathlib import Path
+
+from stock_sentiment_ai import dailylog
+from stock_sentiment_ai.util import today_ymd_local
+
+
+def _crashed_log(path: Path, lines: bytes) -> None:
+    """A daily log as a run leaves it when it dies after a sync flush: no gzip trailer."""
+    with open(path, "wb") as raw:
+        g = gzip.GzipFile(fileobj=raw, mode="wb")
+        g.write(lines)
+        g.flush(zlib.Z_SYNC_FLUSH)
+        raw.flush()
+        g.fileobj = None  # never write the trailer
+
+
+def _ns(log_dir: Path) -> list:
+    return [rec["n"] for rec in dailylog.iter_log_records(str(log_dir))]
+
+
+def test_crash_then_append_keeps_every_record(tmp_path: Path) -> None:
+    day = today_ymd_local()
+    _crashed_log(tmp_path / f"{day}.jsonl.gz", b'{"kind":"item","n":1}\n{"kind":"item","n":2}\n')
+
+    writer = dailylog.DailyLogWriter(str(tmp_path))
+    writer.log_event("briefing", n=3)
+    writer.close()
+
+    # The next run starts a new file rather than appending behind the broken member
+    assert sorted(os.listdir(tmp_path)) == [f"{day}.1.jsonl.gz", f"{day}.jsonl.gz"]
+    assert _ns(tmp_path) == [1, 2, 3]
+
+    writer = dailylog.DailyLogWriter(str(tmp_path))
+    writer.log_event("briefing", n=4)
+    writer.close()
+
+    assert len(os.listdir(tmp_path)) == 2
+    assert _ns(tmp_path) == [1, 2, 3, 4]
+
+
+def test_reader_resumes_after_unfinished_member(tmp_path: Path) -> None:
+    # What older writers produced: a new member appended behind a crashed one,
+    # the crash having cut the last record short
+    path = tmp_path / f"{today_ymd_local()}.jsonl.gz"
+    _crashed_log(path, b'{"kind":"item","n":1}\n{"kind":"item","n":')
+    with gzip.open(path, "at", encoding="utf-8") as f:
+        f.write('{"kind":"briefing","n":2}\n')
+
+    assert _ns(tmp_path) == [1, 2]
+    assert [rec["n"] for rec in dailylog.iter_log_records(str(tmp_path), kinds=["briefing"])] == [2]
+
+
+def test_truncated_file_yields_records_before_the_damage(tmp_path: Path) -> None:
+    day = today_ymd_local()
+    writer = dailylog.DailyLogWriter(str(tmp_path))
+    for n in range(50):
+        writer.log_event("item", n=n)
+    writer.close()
+
+    path = tmp_path / f"{day}.jsonl.gz"
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) // 2])
+
+    ns = _ns(tmp_path)
+    assert 0 < len(ns) < 50
+    assert ns == list(range(len(ns)))
+
+
+def test_reader_reads_in_blocks(tmp_path: Path, monkeypatch) -> None:
+    # Tiny blocks put member headers and records across block boundaries
+    monkeypatch.setattr(dailylog, "_READ_BLOCK", 3)
+    path = tmp_path / f"{today_ymd_local()}.jsonl.gz"
+    _crashed_log(path, b'{"kind":"item","n":1}\n{"kind":"item","n":')
+    for n in (2, 3):
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            f.write(f'{{"kind":"item","n":{n}}}\n')
+
+    assert _ns(tmp_path) == [1, 2, 3]
+    assert dailylog._gzip_complete(str(path))
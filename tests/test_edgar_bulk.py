@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import zipfile
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from stock_sentiment_ai import edgar_bulk, insiders_sec
+
+CIK = "0000320193"
+OTHER = "0000789019"
+
+
+def _recent(rows: List[tuple]) -> Dict[str, list]:
+    # rows: (form, filingDate, accessionNumber), newest first
+    return {
+        "form": [r[0] for r in rows],
+        "filingDate": [r[1] for r in rows],
+        "accessionNumber": [r[2] for r in rows],
+    }
+
+
+@pytest.fixture
+def state_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    d = tmp_path / "submissions"
+    monkeypatch.setattr(insiders_sec, "SUBMISSIONS_CACHE_DIR", d)
+    return d
+
+
+@pytest.fixture
+def bulk_zip(tmp_path: Path) -> Path:
+    path = tmp_path / "submissions.zip"
+    main = {
+        "cik": CIK,
+        "filings": {
+            "recent": _recent(
+                [
+                    ("4", "2026-01-10", "0000000000-26-000003"),
+                    ("10-Q", "2026-01-09", "0000000000-26-000002"),
+                    ("4", "2026-01-08", "0000000000-26-000001"),
+                ]
+            )
+        },
+    }
+    page = _recent([("4", "2025-12-01", "0000000000-25-000009")])
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(f"CIK{CIK}.json", json.dumps(main))
+        zf.writestr(f"CIK{CIK}-submissions-001.json", json.dumps(page))
+        zf.writestr("CIK0000000001.json", json.dumps({"filings": {"recent": _recent([("4", "2026-01-01", "x")])}}))
+    return path
+
+
+def _accessions(cik10: str) -> List[str]:
+    state = insiders_sec._load_submissions_state(cik10)
+    assert state is not None
+    return [f["accession"] for f in state["filings"]]
+
+
+def test_ingest_reads_only_wanted_ciks(state_dir: Path, bulk_zip: Path) -> None:
+    stats = edgar_bulk.ingest_submissions_zip(str(bulk_zip), ciks=[CIK])
+
+    assert stats == {"ciks": 1, "ciks_found": 1, "members_read": 2, "form4_filings": 3}
+    assert _accessions(CIK) == ["0000000000-26-000003", "0000000000-26-000001", "0000000000-25-000009"]
+    assert insiders_sec._load_submissions_state(CIK)["last_accession"] == "0000000000-26-000003"
+    assert not (state_dir / "CIK0000000001.json").exists()
+
+
+def test_cik_missing_from_zip_keeps_its_state(state_dir: Path, bulk_zip: Path) -> None:
+    polled = {
+        "checked_at": 123.0,
+        "etag": '"abc"',
+        "last_modified": "",
+        "last_accession": "0000000000-26-000050",
+        "filings": [{"filing_date": "2026-02-01", "url": "u", "accession": "0000000000-26-000050"}],
+    }
+    insiders_sec._save_submissions_state(OTHER, polled)
+
+    stats = edgar_bulk.ingest_submissions_zip(str(bulk_zip), ciks=[CIK, OTHER])
+
+    assert stats["ciks_found"] == 1
+    assert insiders_sec._load_submissions_state(OTHER) == polled
+
+
+def test_older_zip_merges_into_polled_state(
+    state_dir: Path, bulk_zip: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    newer = {"filing_date": "2026-02-01", "url": "u", "accession": "0000000000-26-000050"}
+    insiders_sec._save_submissions_state(
+        CIK,
+        {
+            "checked_at": 0.0,
+            "etag": '"abc"',
+            "last_modified": "",
+            "last_accession": newer["accession"],
+            "filings": [newer, {"filing_date": "2026-01-10", "url": "u", "accession": "0000000000-26-000003"}],
+        },
+    )
+
+    edgar_bulk.ingest_submissions_zip(str(bulk_zip), ciks=[CIK])
+
+    state = insiders_sec._load_submissions_state(CIK)
+    assert state["etag"] == '"abc"'
+    assert state["last_accession"] == newer["accession"]
+    assert _accessions(CIK) == [
+        newer["accession"],
+        "0000000000-26-000003",
+        "0000000000-26-000001",
+        "0000000000-25-000009",
+    ]
+
+    # The next poll must not report what was already seen as new
+    class Response:
+        status_code = 200
+        headers: Dict[str, str] = {}
+
+        def json(self) -> dict:
+            return {
+                "filings": {
+                    "recent": _recent(
+                        [("4", "2026-02-01", newer["accession"]), ("4", "2026-01-10", "0000000000-26-000003")]
+                    )
+                }
+            }
+
+    class Client:
+        def get(self, url: str, headers=None, timeout: int = 20) -> Response:
+            return Response()
+
+    monkeypatch.setattr(insiders_sec, "SEC_OFFLINE", False)
+    monkeypatch.setattr(insiders_sec, "get_sec_client", lambda: Client())
+    assert insiders_sec.fetch_new_form4_filings(CIK) == []
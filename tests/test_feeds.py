@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+# The fast RSS path must either decline a document or return exactly what
+# feedparser would, so every fixture is checked against feedparser.
+
+import time
+
+import feedparser
+import pytest
+
+from stock_sentiment_ai import feeds
+from stock_sentiment_ai.fixtures import make_rss
+
+
+def _rss(items: str) -> bytes:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>t</title>'
+        f"{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+_GN_DESC = (
+    "&lt;a href=&quot;https://news.google.com/rss/articles/x?oc=5&amp;amp;hl=en&quot; "
+    "target=&quot;_blank&quot;&gt;{}&lt;/a&gt;&amp;nbsp;&amp;nbsp;&lt;font color=&quot;#6f6f6f&quot;&gt;{}&lt;/font&gt;"
+)
+
+# Edge cases for the fast RSS path. `fast` says whether the fast path should
+# take the document (False: it must hand it to feedparser).
+PARSER_FIXTURES = [
+    ("apostrophes_ampersands", True, _rss(
+        "<item><title>Nvidia&#39;s S&amp;P weight hits &quot;record&quot; - Reuters</title>"
+        "<link>https://news.google.com/rss/articles/a1?oc=5</link><guid>a1</guid>"
+        "<pubDate>Mon, 05 Jan 2026 14:30:00 GMT</pubDate>"
+        f"<description>{_GN_DESC.format('Nvidia&amp;#39;s S&amp;amp;P weight', 'Reuters')}</description>"
+        '<source url="https://www.reuters.com">Reuters</source></item>'
+    )),
+    ("cdata_cluster_list", True, _rss(
+        "<item><title>Gold climbs - Bloomberg</title><link>https://news.google.com/rss/articles/a2</link>"
+        "<pubDate>Mon, 05 Jan 2026 15:00:00 GMT</pubDate><description><![CDATA[<ol>"
+        '<li><a href="https://news.google.com/rss/articles/a2" target="_blank">Gold climbs</a>'
+        '&nbsp;&nbsp;<font color="#6f6f6f">Bloomberg</font></li>'
+        '<li><a href="https://news.google.com/rss/articles/a3" target="_blank">Gold up</a>'
+        '&nbsp;&nbsp;<font color="#6f6f6f">CNBC</font></li></ol>]]></description></item>'
+    )),
+    ("plain_description_no_source_no_date", True, _rss(
+        "<item><title>  Oil slides on supply worries - MarketWatch  </title>"
+        "<link> https://example.com/oil?a=1&amp;b=2 </link><description>Brent fell 2%.</description></item>"
+        "<item><title></title><link>https://example.com/empty</link></item>"
+    )),
+    ("author_element", False, _rss(
+        "<item><title>t</title><link>https://example.com/a</link><author>a@b.com (A)</author></item>"
+    )),
+    ("unknown_description_markup", False, _rss(
+        "<item><title>t</title><link>https://example.com/a</link>"
+        "<description>&lt;p&gt;hello&lt;/p&gt;</description></item>"
+    )),
+    ("relative_link", False, _rss("<item><title>t</title><link>/a</link></item>")),
+    ("atom", False, (
+        b'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>'
+        b'<entry><title>Atom item</title><link href="https://example.com/a"/>'
+        b"<updated>2026-01-05T10:00:00Z</updated></entry></feed>"
+    )),
+    ("malformed", False, b'<?xml version="1.0"?><rss version="2.0"><channel><item><title>t</title>'),
+]
+
+
+GENERATED = [(f"generated_{n}", True, make_rss(n)) for n in (10, 500)]
+
+
+@pytest.mark.parametrize(
+    "doc, expect_fast",
+    [pytest.param(doc, fast, id=name) for name, fast, doc in PARSER_FIXTURES + GENERATED],
+)
+def test_fast_path_matches_feedparser(doc: bytes, expect_fast: bool) -> None:
+    fast = feeds._parse_rss_fast(doc)
+    ref = feeds._items_from_entries(feedparser.parse(doc).entries)
+
+    assert (fast is not None) == expect_fast
+    if fast is not None:
+        assert fast == ref
+
+
+@pytest.mark.parametrize("doc", [pytest.param(doc, id=name) for name, _, doc in PARSER_FIXTURES])
+def test_parse_rss_falls_back_to_feedparser(doc: bytes) -> None:
+    assert feeds.parse_rss(doc) == feeds._items_from_entries(feedparser.parse(doc).entries)
+
+
+def test_zero_cache_ttl_revalidates_every_fetch(tmp_path, monkeypatch) -> None:
+    calls = []
+
+    def download(url, etag=None, modified=None):
+        calls.append(etag)
+        if etag:
+            return 304, b"", etag, modified
+        return 200, make_rss(3), '"v1"', None
+
+    monkeypatch.setattr(feeds, "FEED_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(feeds, "_download", download)
+    monkeypatch.setattr(feeds, "_CACHE_TTL_SECS", feeds._CACHE_TTL_SECS)
+    url = "https://example.com/feed.xml"
+
+    first = feeds.fetch_rss(url, use_cache=True)
+    assert feeds.fetch_rss(url, use_cache=True) == first
+    assert calls == [None]  # fresh copy served with no request
+
+    feeds.set_cache_ttl(0)
+    assert feeds.fetch_rss(url, use_cache=True) == first
+    assert calls == [None, '"v1"']
+
+
+def test_iter_many_keeps_order_and_bounds_fetches_ahead(monkeypatch) -> None:
+    started = []
+    monkeypatch.setattr(feeds, "fetch_rss", lambda url: started.append(url) or [url])
+    urls = [f"https://example.com/{n}" for n in range(40)]
+
+    it = feeds.iter_many(urls, max_workers=2)
+    assert next(it) == [urls[0]]
+    time.sleep(0.05)
+    assert len(started) <= 5  # two per worker, plus the one refilled
+    assert [feed for feed in it] == [[u] for u in urls[1:]]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from stock_sentiment_ai import feeds
+from stock_sentiment_ai.briefing import mode_window, now_et
+from stock_sentiment_ai.feeds import FeedItem
+from stock_sentiment_ai.scanner import ItemFilter, _cluster
+
+
+def _item(link: str, published_dt: datetime | None, title: str = "") -> FeedItem:
+    return FeedItem(
+        title=title or f"headline {link}",
+        link=link,
+        source="Reuters",
+        summary="",
+        author="",
+        published_raw="",
+        published_dt=published_dt,
+    )
+
+
+def test_minus_zero_offset_pubdate_parses_as_utc() -> None:
+    doc = (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>t</title>'
+        "<item><title>Gold climbs - Reuters</title><link>https://example.com/a</link>"
+        "<pubDate>Mon, 05 Jan 2026 14:30:00 -0000</pubDate></item></channel></rss>"
+    ).encode("utf-8")
+    (item,) = feeds.parse_rss(doc)
+    assert item.published_dt == datetime(2026, 1, 5, 14, 30, tzinfo=timezone.utc)
+
+
+def test_window_filter_accepts_naive_dates() -> None:
+    start_dt, end_dt, _ = mode_window("auto", now_et())
+    assert start_dt is not None and end_dt is not None
+    inside = (start_dt + (end_dt - start_dt) / 2).astimezone(timezone.utc).replace(tzinfo=None)
+    outside = (start_dt - timedelta(days=3)).astimezone(timezone.utc).replace(tzinfo=None)
+
+    flt = ItemFilter(start_dt, end_dt)
+    kept = flt.apply([_item("https://example.com/in", inside), _item("https://example.com/out", outside)])
+
+    assert [it.link for it in kept] == ["https://example.com/in"]
+    assert flt.rejected["out_of_window"] == 1
+
+
+def test_seen_syndicated_copy_drops_the_whole_cluster() -> None:
+    title = "Gold climbs to record as Fed signals rate cuts ahead"
+    now = datetime.now(timezone.utc)
+    items = [
+        _item("https://example.com/original", now, title),
+        _item("https://example.com/syndicated", now, title),
+        _item("https://example.com/other", now, "Oil slips as OPEC output rises again"),
+    ]
+
+    # Only the representative was stored or remembered by the earlier cycle
+    flt = ItemFilter(seen_links={"https://example.com/original"})
+    reps, sizes = _cluster(flt.apply(items), True, flt)
+
+    assert [it.link for it in reps] == ["https://example.com/other"]
+    assert sizes == [1]
+    assert flt.rejected["seen"] == 2